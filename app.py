@@ -1,22 +1,46 @@
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, request, jsonify, render_template, g, has_request_context
 from flask_sqlalchemy import SQLAlchemy
-from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity
+from flask_jwt_extended import JWTManager, jwt_required, create_access_token, get_jwt_identity, get_current_user
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime, timedelta, date
+from decimal import Decimal
 from flask_cors import CORS
-from sqlalchemy import Numeric, Text
+from sqlalchemy import Numeric, Text, and_, or_, event, inspect as sqlalchemy_inspect
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import joinedload
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 import os
+import json
+import base64
+import hmac
+import tempfile
+import threading
+import time
+import logging
+from collections import namedtuple
 from dotenv import load_dotenv
 from urllib.parse import quote_plus
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from flask import send_file
+from xml.sax.saxutils import escape
+from audit_writer import AuditLogWriter
+from file_store import create_file_store
+from export_jobs import ExportJobRunner
+from month_stats import MonthStats, day_masks, period_days
+from response_cache import ResponseCache
+from principal_cache import PrincipalCache
+from request_metrics import RequestMetrics
+from flask import send_file, Response, stream_with_context, make_response
 import io
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib.units import inch
+import csv
+from functools import wraps
+from itertools import groupby
+import importlib.util
+
+# Export renderers (openpyxl, reportlab, pyarrow) are imported on first use, not at startup:
+# every server worker would otherwise pay their import time and memory. pyarrow is optional.
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
 
 app = Flask(__name__)
 
@@ -58,6 +82,76 @@ app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
     'pool_pre_ping': True,
     'pool_recycle': 300,
 }
+# Request threads per server process (gunicorn.conf.py serves with the same value). Each
+# thread holds at most one pooled connection, plus one for the audit log writer thread.
+app.config['WEB_THREADS'] = int(os.getenv('WEB_THREADS', '4'))
+if not app.config['SQLALCHEMY_DATABASE_URI'].startswith('sqlite'):
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'].update({
+        'pool_size': int(os.getenv('DB_POOL_SIZE', str(app.config['WEB_THREADS'] + 1))),
+        'max_overflow': int(os.getenv('DB_MAX_OVERFLOW', '2')),
+        'pool_timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+    })
+# Rows fetched per round trip when streaming large exports from a server-side cursor
+app.config['EXPORT_STREAM_BATCH_SIZE'] = int(os.getenv('EXPORT_STREAM_BATCH_SIZE', '1000'))
+# Size of each chunk written to the client by streamed downloads
+app.config['EXPORT_STREAM_CHUNK_SIZE'] = int(os.getenv('EXPORT_STREAM_CHUNK_SIZE', str(64 * 1024)))
+# Employees per Parquet row group in format=parquet exports
+app.config['EXPORT_PARQUET_ROW_GROUP_SIZE'] = int(os.getenv('EXPORT_PARQUET_ROW_GROUP_SIZE', '10000'))
+# Longest custom start_date..end_date range an export may cover
+app.config['EXPORT_MAX_RANGE_DAYS'] = int(os.getenv('EXPORT_MAX_RANGE_DAYS', '366'))
+# Page size limits for keyset-paginated listings
+app.config['LISTING_DEFAULT_PAGE_SIZE'] = 100
+app.config['LISTING_MAX_PAGE_SIZE'] = 500
+# Generated files are kept in a content-addressed store instead of database blobs
+app.config['FILE_STORAGE_BACKEND'] = os.getenv('FILE_STORAGE_BACKEND', 'local')
+app.config['FILE_STORAGE_ROOT'] = os.getenv('FILE_STORAGE_ROOT', os.path.join(app.instance_path, 'file_store'))
+# Audit log pipeline: rows are queued and inserted in batches by a background thread
+app.config['AUDIT_LOG_ASYNC'] = os.getenv('AUDIT_LOG_ASYNC', 'true').lower() == 'true'
+app.config['AUDIT_FLUSH_INTERVAL'] = float(os.getenv('AUDIT_FLUSH_INTERVAL', '1.0'))
+app.config['AUDIT_BATCH_SIZE'] = int(os.getenv('AUDIT_BATCH_SIZE', '500'))
+app.config['AUDIT_QUEUE_SIZE'] = int(os.getenv('AUDIT_QUEUE_SIZE', '10000'))
+# Rows per multi-row INSERT ... ON CONFLICT statement (keeps bound parameters under driver limits)
+app.config['BULK_UPSERT_CHUNK_SIZE'] = int(os.getenv('BULK_UPSERT_CHUNK_SIZE', '500'))
+# Limits of one POST /admin/attendance/range request (days spanned, employee-day records written)
+app.config['ATTENDANCE_RANGE_MAX_DAYS'] = int(os.getenv('ATTENDANCE_RANGE_MAX_DAYS', '366'))
+app.config['ATTENDANCE_RANGE_MAX_RECORDS'] = int(os.getenv('ATTENDANCE_RANGE_MAX_RECORDS', '50000'))
+# Longest start_date..end_date range of GET /admin/employees/<id>/attendance-stats
+app.config['EMPLOYEE_STATS_MAX_RANGE_DAYS'] = int(os.getenv('EMPLOYEE_STATS_MAX_RANGE_DAYS', '1096'))
+# Generated reports are reused until their month's data version changes; entries are evicted by
+# age and total size (the exported files themselves stay in the file history)
+app.config['REPORT_CACHE_ENABLED'] = os.getenv('REPORT_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['REPORT_CACHE_MAX_BYTES'] = int(os.getenv('REPORT_CACHE_MAX_BYTES', str(500 * 1024 * 1024)))
+app.config['REPORT_CACHE_MAX_AGE_DAYS'] = int(os.getenv('REPORT_CACHE_MAX_AGE_DAYS', '30'))
+# Cache hits are counted in memory and written with last_used_at at most this often per entry
+app.config['REPORT_CACHE_TOUCH_SECONDS'] = int(os.getenv('REPORT_CACHE_TOUCH_SECONDS', '300'))
+# PDF export: employee rows per table chunk, worker processes for parallel department
+# sections (needs pypdf) and the render time above which a warning is logged
+app.config['PDF_TABLE_CHUNK_SIZE'] = int(os.getenv('PDF_TABLE_CHUNK_SIZE', '200'))
+app.config['PDF_SECTION_WORKERS'] = int(os.getenv('PDF_SECTION_WORKERS', str(min(4, os.cpu_count() or 1))))
+app.config['PDF_RENDER_BUDGET_SECONDS'] = float(os.getenv('PDF_RENDER_BUDGET_SECONDS', '30'))
+# In-process cache of read-heavy JSON listings (LRU, per server process)
+app.config['RESPONSE_CACHE_ENABLED'] = os.getenv('RESPONSE_CACHE_ENABLED', 'true').lower() == 'true'
+app.config['RESPONSE_CACHE_MAX_BYTES'] = int(os.getenv('RESPONSE_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+app.config['RESPONSE_CACHE_MAX_ENTRIES'] = int(os.getenv('RESPONSE_CACHE_MAX_ENTRIES', '1024'))
+# Seconds a dashboard summary may be reused; bounds staleness of counts without a data version (pending leaves)
+app.config['DASHBOARD_CACHE_TTL'] = int(os.getenv('DASHBOARD_CACHE_TTL', '30'))
+# Resolved JWT admins are cached per server process; the TTL bounds staleness after edits elsewhere
+app.config['AUTH_PRINCIPAL_CACHE_TTL'] = float(os.getenv('AUTH_PRINCIPAL_CACHE_TTL', '60'))
+app.config['AUTH_PRINCIPAL_CACHE_MAX_ENTRIES'] = int(os.getenv('AUTH_PRINCIPAL_CACHE_MAX_ENTRIES', '1024'))
+# Prometheus metrics at /metrics (off unless enabled; when METRICS_TOKEN is set scrapers must send
+# it as a bearer token), and statements slower than the threshold logged as JSON lines (to
+# SLOW_QUERY_LOG_FILE when set, otherwise stderr). Parameters are logged as their types only;
+# SLOW_QUERY_LOG_PARAMETERS=true logs the bound values, which include personal data and password hashes
+app.config['METRICS_ENABLED'] = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')
+app.config['SLOW_QUERY_THRESHOLD_MS'] = float(os.getenv('SLOW_QUERY_THRESHOLD_MS', '500'))
+app.config['SLOW_QUERY_LOG_FILE'] = os.getenv('SLOW_QUERY_LOG_FILE')
+app.config['SLOW_QUERY_LOG_PARAMETERS'] = os.getenv('SLOW_QUERY_LOG_PARAMETERS', 'false').lower() == 'true'
+# Background export jobs: worker processes per server process, and a cap on queued + running jobs
+app.config['EXPORT_JOB_WORKERS'] = int(os.getenv('EXPORT_JOB_WORKERS', str(min(4, os.cpu_count() or 1))))
+app.config['EXPORT_JOB_MAX_PENDING'] = int(os.getenv('EXPORT_JOB_MAX_PENDING', '20'))
+# Jobs still queued/running after this many seconds are treated as lost (server restarted mid-job)
+app.config['EXPORT_JOB_TIMEOUT'] = int(os.getenv('EXPORT_JOB_TIMEOUT', '900'))
 
 # Small hint in logs about which backend is in use (no secrets printed)
 try:
@@ -68,41 +162,163 @@ except Exception:
 # Initialize extensions
 db = SQLAlchemy(app)
 jwt = JWTManager(app)
+file_store = create_file_store(app.config['FILE_STORAGE_BACKEND'], app.config['FILE_STORAGE_ROOT'])
+response_cache = ResponseCache(
+    max_bytes=app.config['RESPONSE_CACHE_MAX_BYTES'],
+    max_entries=app.config['RESPONSE_CACHE_MAX_ENTRIES']
+)
+principal_cache = PrincipalCache(
+    max_entries=app.config['AUTH_PRINCIPAL_CACHE_MAX_ENTRIES'],
+    ttl=app.config['AUTH_PRINCIPAL_CACHE_TTL']
+)
+
+# Request instrumentation: latency, SQL statements, DB time and ORM loads per endpoint
+request_metrics = RequestMetrics()
+slow_query_logger = logging.getLogger('attendance.slow_queries')
+slow_query_logger.propagate = False
+slow_query_logger.setLevel(logging.INFO)
+slow_query_logger.addHandler(
+    logging.FileHandler(app.config['SLOW_QUERY_LOG_FILE']) if app.config['SLOW_QUERY_LOG_FILE']
+    else logging.StreamHandler()
+)
+SLOW_QUERY_MAX_PARAMETERS_LENGTH = 2000
+
+def parameter_types(parameters):
+    """Bound parameters with every value replaced by its type name (executemany: row count and first row)"""
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)) and parameters and isinstance(parameters[0], (list, tuple, dict)):
+        return {'rows': len(parameters), 'first_row': parameter_types(parameters[0])}
+    return [type(value).__name__ for value in parameters or ()]
+
+def metrics_endpoint_label():
+    """Route template of the current request (bounded cardinality), 'unmatched' for unknown URLs"""
+    return request.url_rule.rule if request.url_rule else 'unmatched'
+
+@app.before_request
+def start_request_metrics():
+    g.metrics_started = time.perf_counter()
+    g.sql_statements = 0
+    g.sql_seconds = 0.0
+    g.orm_objects_loaded = 0
+
+@app.after_request
+def record_request_metrics(response):
+    # Streamed bodies are produced after this hook; their time and queries are not included
+    if 'metrics_started' in g:
+        request_metrics.observe_request(
+            metrics_endpoint_label(), request.method, response.status_code,
+            time.perf_counter() - g.metrics_started, g.sql_statements, g.sql_seconds, g.orm_objects_loaded
+        )
+    return response
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_started_at', []).append(time.perf_counter())
+
+@event.listens_for(Engine, 'handle_error')
+def discard_query_timer(exception_context):
+    started = exception_context.connection.info.get('query_started_at') if exception_context.connection else None
+    if started:
+        started.pop()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def record_query_metrics(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_started_at'].pop()
+    in_request = has_request_context() and 'metrics_started' in g
+    if in_request:
+        g.sql_statements += 1
+        g.sql_seconds += elapsed
+    else:
+        request_metrics.observe_background_query(elapsed)
+    
+    if elapsed * 1000 >= app.config['SLOW_QUERY_THRESHOLD_MS']:
+        request_metrics.record_slow_query()
+        # Parameters are logged as JSON values (or just their types); oversized ones as a truncated string
+        logged = parameters if app.config['SLOW_QUERY_LOG_PARAMETERS'] else parameter_types(parameters)
+        parameters_text = json.dumps(logged, default=str)
+        if len(parameters_text) > SLOW_QUERY_MAX_PARAMETERS_LENGTH:
+            logged_parameters = parameters_text[:SLOW_QUERY_MAX_PARAMETERS_LENGTH] + '...'
+        else:
+            logged_parameters = json.loads(parameters_text)
+        slow_query_logger.info(json.dumps({
+            'event': 'slow_query',
+            'at': datetime.utcnow().isoformat(),
+            'duration_ms': round(elapsed * 1000, 3),
+            'threshold_ms': app.config['SLOW_QUERY_THRESHOLD_MS'],
+            'endpoint': metrics_endpoint_label() if in_request else None,
+            'method': request.method if in_request else None,
+            'statement': ' '.join(statement.split()),
+            'parameters': logged_parameters,
+            'executemany': executemany
+        }))
+
+@event.listens_for(db.Model, 'load', propagate=True)
+def count_orm_object_loaded(target, context):
+    if has_request_context() and 'orm_objects_loaded' in g:
+        g.orm_objects_loaded += 1
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus scrape endpoint (counters of this server process)"""
+    if not app.config['METRICS_ENABLED']:
+        return jsonify({'message': 'Metrics are disabled'}), 404
+    token = app.config['METRICS_TOKEN']
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        return jsonify({'message': 'Invalid metrics token'}), 401
+    return Response(request_metrics.render(), mimetype='text/plain; version=0.0.4')
 
 # Helper Functions
 def log_audit_action(user_id, action, table_name=None, record_id=None, old_values=None, new_values=None, description=None):
-    """Log audit action to database"""
+    """Log audit action to database
+    
+    The row is handed to the buffered audit writer, which inserts it on its own
+    connection; the caller's session is never committed or rolled back here.
+    """
     try:
         # Get IP address and user agent from request
         ip_address = request.remote_addr if request else None
         user_agent = request.headers.get('User-Agent') if request else None
         
-        audit_log = AuditLog(
-            user_id=user_id,
-            action=action,
-            table_name=table_name,
-            record_id=record_id,
-            old_values=old_values,
-            new_values=new_values,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            description=description
-        )
-        db.session.add(audit_log)
-        db.session.commit()
+        row = {
+            'user_id': int(user_id),
+            'action': action,
+            'table_name': table_name,
+            'record_id': record_id,
+            # Values are captured now; anything not JSON-serializable is stored as its string form
+            'old_values': json.loads(json.dumps(old_values, default=str)) if old_values is not None else None,
+            'new_values': json.loads(json.dumps(new_values, default=str)) if new_values is not None else None,
+            'ip_address': ip_address,
+            'user_agent': user_agent[:255] if user_agent else None,
+            'description': description,
+            'created_at': datetime.utcnow()
+        }
+        if app.config['AUDIT_LOG_ASYNC']:
+            audit_writer.submit(row, db.engine)
+        else:
+            audit_writer.write_now(row, db.engine)
     except Exception as e:
         print(f"Audit log error: {e}")
-        db.session.rollback()
 
-def save_file_to_db(file_data, filename, file_type, description=None, related_table=None, related_id=None):
-    """Save file data to database"""
+def save_file_to_db(file_data, filename, file_type, description=None, related_table=None, related_id=None,
+                    uploaded_by=None):
+    """Save a generated file: content goes to the file store, metadata to FileStorage
+    
+    file_data may be bytes or a binary file object (e.g. a spooled export).
+    uploaded_by defaults to the current JWT identity (background jobs pass it explicitly).
+    """
     try:
         import os
         from werkzeug.utils import secure_filename
         
         # Generate secure filename
         secure_name = secure_filename(filename)
-        file_size = len(file_data)
+        
+        # Content-addressed: identical exports share one blob on disk
+        if hasattr(file_data, 'read'):
+            content_hash, file_size = file_store.put_file(file_data)
+        else:
+            content_hash, file_size = file_store.put_bytes(file_data)
         
         # Determine MIME type based on extension
         mime_types = {
@@ -110,6 +326,7 @@ def save_file_to_db(file_data, filename, file_type, description=None, related_ta
             '.xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             '.xls': 'application/vnd.ms-excel',
             '.csv': 'text/csv',
+            '.parquet': 'application/vnd.apache.parquet',
             '.png': 'image/png',
             '.jpg': 'image/jpeg',
             '.jpeg': 'image/jpeg'
@@ -124,12 +341,13 @@ def save_file_to_db(file_data, filename, file_type, description=None, related_ta
             file_type=file_type,
             file_size=file_size,
             mime_type=mime_type,
-            file_path=f'/uploads/{secure_name}',
-            file_data=file_data,
+            file_path=file_store.relative_path(content_hash),
+            content_hash=content_hash,
+            storage_backend=file_store.name,
             description=description,
             related_table=related_table,
             related_id=related_id,
-            uploaded_by=get_jwt_identity()
+            uploaded_by=uploaded_by if uploaded_by is not None else get_jwt_identity()
         )
         
         db.session.add(file_storage)
@@ -141,15 +359,712 @@ def save_file_to_db(file_data, filename, file_type, description=None, related_ta
         db.session.rollback()
         return None
 
+ATTENDANCE_STATUSES = ('present', 'half_day', 'absent', 'leave', 'overtime')
+SUMMARY_COUNT_COLUMNS = tuple(f'{status}_count' for status in ATTENDANCE_STATUSES) + ('marked_count',)
+# Cell codes of the overview matrix: index in this tuple, 0 = not marked, last = unrecognised status
+ATTENDANCE_STATUS_CODES = ('not_marked',) + ATTENDANCE_STATUSES + ('other',)
+
+def chunked(items, size=500):
+    """Split a sequence into lists of at most size items (keeps IN clauses within driver limits)"""
+    items = list(items)
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def summary_count_vector(status, sign=1):
+    """Summary column deltas contributed by a single attendance status"""
+    vector = dict.fromkeys(SUMMARY_COUNT_COLUMNS, 0)
+    if status is not None:
+        vector['marked_count'] = sign
+        if status in ATTENDANCE_STATUSES:
+            vector[f'{status}_count'] = sign
+    return vector
+
+def update_monthly_summary(changes):
+    """Apply attendance changes to attendance_monthly_summary (and the daily counts) without committing.
+    
+    changes is an iterable of (employee_id, date, old_status, new_status); use None for
+    the old status of an insert or the new status of a delete. Employees that end up with
+    the same delta in the same month are updated together in one set-based UPDATE.
+    """
+    changes = list(changes)
+    update_attendance_daily_counts(changes)
+    
+    deltas = {}
+    changed_months = set()
+    for employee_id, day, old_status, new_status in changes:
+        if old_status == new_status:
+            continue
+        # Reports show weekends too, so every change invalidates cached reports of its month
+        changed_months.add(day.replace(day=1))
+        if day.weekday() >= 5:
+            continue
+        vector = deltas.setdefault((day.replace(day=1), employee_id), dict.fromkeys(SUMMARY_COUNT_COLUMNS, 0))
+        for status, sign in ((old_status, -1), (new_status, 1)):
+            for column, delta in summary_count_vector(status, sign).items():
+                vector[column] += delta
+    
+    bump_report_versions(report_month_scope(month) for month in changed_months)
+    
+    groups = {}
+    for (month, employee_id), vector in deltas.items():
+        signature = tuple(vector[column] for column in SUMMARY_COUNT_COLUMNS)
+        if any(signature):
+            groups.setdefault((month, signature), []).append(employee_id)
+    if not groups:
+        return
+    
+    table = AttendanceMonthlySummary.__table__
+    
+    # Create zeroed rows for employees that have no summary for the month yet
+    employees_by_month = {}
+    for (month, _), employee_ids in groups.items():
+        employees_by_month.setdefault(month, set()).update(employee_ids)
+    now = datetime.utcnow()
+    for month, employee_ids in employees_by_month.items():
+        existing = set()
+        for chunk in chunked(employee_ids):
+            existing.update(db.session.execute(
+                db.select(table.c.employee_id).where(table.c.month == month, table.c.employee_id.in_(chunk))
+            ).scalars())
+        missing = employee_ids - existing
+        if missing:
+            zeroes = dict.fromkeys(SUMMARY_COUNT_COLUMNS, 0)
+            db.session.execute(table.insert(), [
+                dict(zeroes, employee_id=employee_id, month=month, updated_at=now) for employee_id in missing
+            ])
+    
+    for (month, signature), employee_ids in groups.items():
+        values = {column: table.c[column] + delta for column, delta in zip(SUMMARY_COUNT_COLUMNS, signature) if delta}
+        values['updated_at'] = now
+        for chunk in chunked(employee_ids):
+            db.session.execute(
+                table.update().where(table.c.month == month, table.c.employee_id.in_(chunk)).values(**values)
+            )
+
+def upsert_counters(table, key_column, counter_column, rows):
+    """Add each row's counter value to the stored counter, inserting rows whose key is new.
+    
+    One INSERT ... ON CONFLICT / ON DUPLICATE KEY statement where the dialect supports it,
+    so concurrent writers never race on creating the same key. Does not commit.
+    """
+    if not rows:
+        return
+    key = table.c[key_column]
+    counter = table.c[counter_column]
+    dialect = db.session.get_bind().dialect.name
+    
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        stmt = insert(table).values(rows)
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[key],
+            set_={counter_column: counter + stmt.excluded[counter_column], 'updated_at': stmt.excluded.updated_at}
+        ))
+        return
+    if dialect in ('mysql', 'mariadb'):
+        stmt = mysql_insert(table).values(rows)
+        db.session.execute(stmt.on_duplicate_key_update({
+            counter_column: counter + stmt.inserted[counter_column],
+            'updated_at': stmt.inserted.updated_at
+        }))
+        return
+    
+    existing = set(db.session.execute(db.select(key).where(key.in_([row[key_column] for row in rows]))).scalars())
+    for row in rows:
+        if row[key_column] in existing:
+            db.session.execute(table.update().where(key == row[key_column]).values({
+                counter_column: counter + row[counter_column], 'updated_at': row['updated_at']
+            }))
+    missing = [row for row in rows if row[key_column] not in existing]
+    if missing:
+        db.session.execute(table.insert(), missing)
+
+REPORT_EMPLOYEES_SCOPE = 'employees'
+HOLIDAYS_SCOPE = 'holidays'
+
+def report_month_scope(day):
+    """Data version scope of the month containing day"""
+    return f"month:{day.strftime('%Y-%m')}"
+
+def bump_report_versions(scopes):
+    """Increment the data version of each scope without committing (part of the caller's transaction)
+    
+    Scopes are 'month:YYYY-MM' for attendance and holidays of that month, 'employees'
+    for employee and department changes, which show up in every month's reports, and
+    'holidays' for any holiday change (the holiday listing).
+    """
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    now = datetime.utcnow()
+    upsert_counters(ReportDataVersion.__table__, 'scope', 'version',
+                    [{'scope': scope, 'version': 1, 'updated_at': now} for scope in scopes])
+
+def data_versions(scopes):
+    """Current version of each scope, in order (0 for a scope that was never bumped)"""
+    versions = dict(db.session.execute(
+        db.select(ReportDataVersion.scope, ReportDataVersion.version).where(ReportDataVersion.scope.in_(scopes))
+    ).all())
+    return tuple(versions.get(scope, 0) for scope in scopes)
+
+def report_data_version(first_day, last_day=None):
+    """Version of everything a period's reports are built from, e.g. '12.3' (month.employees)
+    
+    A period spanning several months sums their month versions: versions only grow, so a
+    change in any of those months still yields a new value.
+    """
+    scopes = []
+    month = first_day.replace(day=1)
+    while month <= (last_day or first_day):
+        scopes.append(report_month_scope(month))
+        month = (month + timedelta(days=32)).replace(day=1)
+    *month_versions, employees_version = data_versions(scopes + [REPORT_EMPLOYEES_SCOPE])
+    return f"{sum(month_versions)}.{employees_version}"
+
+def cached_json_response(scopes, ttl=None):
+    """Serve a GET endpoint from response_cache, keyed by the data versions of scopes() and the query string
+    
+    scopes is called per request and may raise ValueError on bad arguments (the view then
+    runs uncached and reports the error). If-None-Match matching the current ETag gets a
+    304 after the version lookup alone; only 200 responses are cached. With ttl (seconds,
+    a callable reading config is allowed) the key also changes every ttl seconds, for
+    data that has no version to bump.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not app.config['RESPONSE_CACHE_ENABLED']:
+                return view(*args, **kwargs)
+            try:
+                resource_scopes = list(scopes())
+            except ValueError:
+                return view(*args, **kwargs)
+            
+            key = (request.endpoint, tuple(zip(resource_scopes, data_versions(resource_scopes))),
+                   tuple(sorted(request.args.items(multi=True))))
+            if ttl is not None:
+                key += (int(time.time() // (ttl() if callable(ttl) else ttl)),)
+            etag = response_cache.etag(key)
+            if request.if_none_match.contains(etag):
+                response_cache.record_not_modified()
+                response = Response(status=304)
+            else:
+                body = response_cache.get(key)
+                if body is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200:
+                        return response
+                    response_cache.put(key, response.get_data())
+                else:
+                    response = Response(body, mimetype='application/json')
+            response.set_etag(etag)
+            # Browsers keep the body but revalidate on every use
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return wrapper
+    return decorator
+
+def overview_cache_scopes():
+    first_day = datetime.strptime(request.args.get('date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+    return [report_month_scope(first_day), REPORT_EMPLOYEES_SCOPE]
+
+def get_cached_report(report_format, first_day, last_day, data_version, report_filter=''):
+    """Return the stored FileStorage of an identical earlier report, or None
+    
+    report_filter is the export_filter_key() of a filtered report ('' for the whole company).
+    """
+    if not app.config['REPORT_CACHE_ENABLED']:
+        return None
+    entry = ReportCacheEntry.query.options(joinedload(ReportCacheEntry.file)).filter_by(
+        report_format=report_format,
+        month=first_day,
+        period_end=last_day,
+        report_filter=report_filter,
+        data_version=data_version
+    ).first()
+    if entry is None:
+        return None
+    
+    file_record = entry.file
+    if not file_record.content_hash or not file_store.exists(file_record.content_hash):
+        # Blob removed behind our back: forget the entry and regenerate
+        db.session.delete(entry)
+        db.session.commit()
+        return None
+    
+    touch_report_cache_entry(entry)
+    return file_record
+
+report_cache_hits = {}  # entry id -> hits not yet written
+report_cache_hits_lock = threading.Lock()
+
+def touch_report_cache_entry(entry):
+    """Count a cache hit without a write per hit
+    
+    Hits accumulate in memory; they are added to hit_count together with a new
+    last_used_at once the stored last_used_at is older than REPORT_CACHE_TOUCH_SECONDS.
+    """
+    now = datetime.utcnow()
+    with report_cache_hits_lock:
+        hits = report_cache_hits.pop(entry.id, 0) + 1
+        if entry.last_used_at > now - timedelta(seconds=app.config['REPORT_CACHE_TOUCH_SECONDS']):
+            report_cache_hits[entry.id] = hits
+            return
+    db.session.execute(
+        ReportCacheEntry.__table__.update().where(ReportCacheEntry.id == entry.id)
+        .values(hit_count=ReportCacheEntry.hit_count + hits, last_used_at=now)
+    )
+    db.session.commit()
+
+def store_cached_report(report_format, first_day, last_day, data_version, file_id, report_filter=''):
+    """Remember a freshly generated report and drop superseded versions of the same report"""
+    if not app.config['REPORT_CACHE_ENABLED'] or file_id is None:
+        return
+    try:
+        superseded = ReportCacheEntry.query.filter(
+            ReportCacheEntry.report_format == report_format,
+            ReportCacheEntry.month == first_day,
+            ReportCacheEntry.period_end == last_day,
+            ReportCacheEntry.report_filter == report_filter,
+            ReportCacheEntry.data_version != data_version
+        ).all()
+        file_record = db.session.get(FileStorage, file_id)
+        now = datetime.utcnow()
+        db.session.add(ReportCacheEntry(
+            report_format=report_format,
+            month=first_day,
+            period_end=last_day,
+            report_filter=report_filter,
+            data_version=data_version,
+            file_id=file_id,
+            file_size=file_record.file_size,
+            created_at=now,
+            last_used_at=now
+        ))
+        db.session.commit()
+    except IntegrityError:
+        # A concurrent request cached the same report first
+        db.session.rollback()
+        return
+    
+    delete_report_cache_entries(superseded)
+    evict_report_cache()
+
+def evict_report_cache():
+    """Drop entries older than REPORT_CACHE_MAX_AGE_DAYS, then least recently used ones over REPORT_CACHE_MAX_BYTES"""
+    cutoff = datetime.utcnow() - timedelta(days=app.config['REPORT_CACHE_MAX_AGE_DAYS'])
+    evicted = []
+    total_size = 0
+    for entry_id, file_size, created_at in db.session.execute(
+        db.select(ReportCacheEntry.id, ReportCacheEntry.file_size, ReportCacheEntry.created_at)
+        .order_by(ReportCacheEntry.last_used_at.desc())
+    ):
+        total_size += file_size
+        if created_at < cutoff or total_size > app.config['REPORT_CACHE_MAX_BYTES']:
+            evicted.append(entry_id)
+    
+    if evicted:
+        delete_report_cache_entries(ReportCacheEntry.query.filter(ReportCacheEntry.id.in_(evicted)).all())
+    return len(evicted)
+
+def delete_report_cache_entries(entries):
+    """Delete cache entries; the FileStorage rows they point to are export history and stay"""
+    if not entries:
+        return
+    with report_cache_hits_lock:
+        for entry in entries:
+            report_cache_hits.pop(entry.id, None)
+    for entry in entries:
+        db.session.delete(entry)
+    db.session.commit()
+
+def send_cached_report(file_record, subject):
+    """Serve a cached report straight from the file store (subject as from export_subject())"""
+    log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None,
+                   None, {'filename': file_record.original_filename, 'file_id': file_record.id, 'cached': True},
+                   f'{file_record.file_type.capitalize()} report served from cache for {subject}')
+    return send_file(
+        file_store.local_path(file_record.content_hash),
+        as_attachment=True,
+        download_name=file_record.original_filename,
+        mimetype=file_record.mime_type,
+        conditional=True,
+        etag=file_record.content_hash
+    )
+
+def update_attendance_daily_counts(changes):
+    """Apply attendance changes to attendance_daily_counts without committing.
+    
+    Only inserts and deletes of marks by active employees move a day's count; a status
+    change on an existing mark does not.
+    """
+    signs = {}
+    for employee_id, day, old_status, new_status in changes:
+        if (old_status is None) != (new_status is None):
+            signs.setdefault(employee_id, []).append((day, 1 if new_status is not None else -1))
+    if not signs:
+        return
+    
+    active = set()
+    for chunk in chunked(signs):
+        active.update(db.session.execute(
+            db.select(Employee.id).where(Employee.id.in_(chunk), Employee.is_active == True)
+        ).scalars())
+    
+    deltas = {}
+    for employee_id in active:
+        for day, sign in signs[employee_id]:
+            deltas[day] = deltas.get(day, 0) + sign
+    now = datetime.utcnow()
+    upsert_counters(AttendanceDailyCount.__table__, 'date', 'marked_count', [
+        {'date': day, 'marked_count': delta, 'updated_at': now}
+        for day, delta in sorted(deltas.items()) if delta
+    ])
+
+def remove_employee_from_daily_counts(employee_id):
+    """Take an active employee's marks out of attendance_daily_counts (deactivation/deletion), without committing"""
+    days = db.session.execute(
+        db.select(Attendance.date).where(Attendance.employee_id == employee_id)
+    ).scalars().all()
+    now = datetime.utcnow()
+    for chunk in chunked(days, app.config['BULK_UPSERT_CHUNK_SIZE']):
+        upsert_counters(AttendanceDailyCount.__table__, 'date', 'marked_count', [
+            {'date': day, 'marked_count': -1, 'updated_at': now} for day in chunk
+        ])
+
+def rebuild_attendance_daily_counts():
+    """Recompute attendance_daily_counts from scratch (backfill / repair, e.g. after is_active edits outside the API)"""
+    table = AttendanceDailyCount.__table__
+    db.session.execute(table.delete())
+    db.session.execute(table.insert().from_select(
+        ['date', 'marked_count', 'updated_at'],
+        db.select(Attendance.date, db.func.count(Attendance.id), db.literal(datetime.utcnow()))
+        .join(Employee, Employee.id == Attendance.employee_id)
+        .where(Employee.is_active == True)
+        .group_by(Attendance.date)
+    ))
+    db.session.commit()
+    return db.session.query(db.func.count(AttendanceDailyCount.id)).scalar()
+
+def build_attendance_matrix(employee_ids, first_day, last_day, export_filter=None):
+    """Row-major bytearray of status codes, one row per employee and one column per day.
+    
+    Built from a single (employee_id, date, status) tuple query; no ORM objects are created.
+    An export_filter is pushed into that query so only the selected employees' rows are read.
+    """
+    day_count = (last_day - first_day).days + 1
+    row_offsets = {employee_id: row * day_count for row, employee_id in enumerate(employee_ids)}
+    codes = {status: code for code, status in enumerate(ATTENDANCE_STATUS_CODES)}
+    other_code = len(ATTENDANCE_STATUS_CODES) - 1
+    matrix = bytearray(len(employee_ids) * day_count)
+    
+    for employee_id, day, status in db.session.execute(
+        db.select(Attendance.employee_id, Attendance.date, Attendance.status).where(
+            Attendance.date >= first_day,
+            Attendance.date <= last_day,
+            *export_attendance_criteria(export_filter)
+        )
+    ):
+        offset = row_offsets.get(employee_id)
+        if offset is not None:
+            matrix[offset + (day - first_day).days] = codes.get(status, other_code)
+    return matrix
+
+def load_month_stats(first_day, last_day, employee_ids, holiday_dates=None, export_filter=None):
+    """Load first_day..last_day for the given employees into the shared MonthStats engine"""
+    if holiday_dates is None:
+        holiday_dates = db.session.execute(
+            db.select(Holiday.date).where(Holiday.date >= first_day, Holiday.date <= last_day)
+        ).scalars().all()
+    matrix = build_attendance_matrix(employee_ids, first_day, last_day, export_filter)
+    return MonthStats.from_buffer(employee_ids, first_day, last_day, matrix, ATTENDANCE_STATUS_CODES, holiday_dates)
+
+def is_whole_months(first_day, last_day):
+    """True when the range starts on a 1st and ends on a month's last day"""
+    return first_day.day == 1 and (last_day + timedelta(days=1)).day == 1
+
+def load_summary_counts(first_day, last_day, holiday_dates, export_filter=None):
+    """Per-employee working-day counts of ATTENDANCE_STATUSES over whole months, from the monthly summary
+    
+    The summary counts every weekday, so marks on weekday holidays are subtracted with one
+    grouped query. Returns {employee_id: [count per status]}; employees without marks are left out.
+    """
+    summary = AttendanceMonthlySummary
+    count_columns = [getattr(summary, f'{status}_count') for status in ATTENDANCE_STATUSES]
+    counts = {
+        employee_id: [int(value) for value in values]
+        for employee_id, *values in db.session.execute(
+            db.select(summary.employee_id, *(db.func.sum(column) for column in count_columns))
+            .join(Employee, Employee.id == summary.employee_id)
+            .where(summary.month >= first_day, summary.month <= last_day, *export_employee_criteria(export_filter))
+            .group_by(summary.employee_id)
+        )
+    }
+    weekday_holidays = sorted(day for day in set(holiday_dates) if first_day <= day <= last_day and day.weekday() < 5)
+    if weekday_holidays:
+        for employee_id, status, count in db.session.execute(
+            db.select(Attendance.employee_id, Attendance.status, db.func.count(Attendance.id))
+            .where(Attendance.date.in_(weekday_holidays), *export_attendance_criteria(export_filter))
+            .group_by(Attendance.employee_id, Attendance.status)
+        ):
+            if employee_id in counts and status in ATTENDANCE_STATUSES:
+                counts[employee_id][ATTENDANCE_STATUSES.index(status)] -= count
+    return counts
+
+def rebuild_monthly_summary():
+    """Recompute attendance_monthly_summary from scratch (backfill / repair)"""
+    table = AttendanceMonthlySummary.__table__
+    counts = {}
+    stmt = db.select(Attendance.employee_id, Attendance.date, Attendance.status).execution_options(
+        yield_per=app.config['EXPORT_STREAM_BATCH_SIZE']
+    )
+    for employee_id, day, status in db.session.execute(stmt):
+        if day.weekday() >= 5:
+            continue
+        vector = counts.setdefault((employee_id, day.replace(day=1)), dict.fromkeys(SUMMARY_COUNT_COLUMNS, 0))
+        for column, delta in summary_count_vector(status).items():
+            vector[column] += delta
+    
+    db.session.execute(table.delete())
+    now = datetime.utcnow()
+    rows = [dict(vector, employee_id=employee_id, month=month, updated_at=now)
+            for (employee_id, month), vector in counts.items()]
+    for chunk in chunked(rows, 5000):
+        db.session.execute(table.insert(), chunk)
+    db.session.commit()
+    return len(rows)
+
+def build_attendance_upsert(values):
+    """Multi-row upsert on the unique_employee_date constraint for the active dialect.
+    
+    Only status, marked_by and updated_at are overwritten on conflict, so check-in/out
+    times, hours and notes on existing rows are preserved. Returns None when the
+    dialect has no native upsert.
+    """
+    table = Attendance.__table__
+    dialect = db.session.get_bind().dialect.name
+    
+    if dialect in ('sqlite', 'postgresql'):
+        insert = sqlite_insert if dialect == 'sqlite' else postgresql_insert
+        stmt = insert(table).values(values)
+        return stmt.on_conflict_do_update(
+            index_elements=[table.c.employee_id, table.c.date],
+            set_={
+                'status': stmt.excluded.status,
+                'marked_by': stmt.excluded.marked_by,
+                'updated_at': stmt.excluded.updated_at
+            }
+        )
+    if dialect in ('mysql', 'mariadb'):
+        stmt = mysql_insert(table).values(values)
+        return stmt.on_duplicate_key_update(
+            status=stmt.inserted.status,
+            marked_by=stmt.inserted.marked_by,
+            updated_at=stmt.inserted.updated_at
+        )
+    return None
+
+def upsert_attendance_rows(rows, marked_by=None):
+    """Insert or update validated (employee_id, date, status) rows without committing.
+    
+    Existing statuses are read with one query, rows whose status would not change are
+    skipped, and the rest are written with multi-row upserts. The monthly summary is
+    updated from the same diff. Returns {(employee_id, date): 'created' | 'updated' | 'unchanged'}.
+    """
+    rows = {(employee_id, day): status for employee_id, day, status in rows}
+    if not rows:
+        return {}
+    
+    dates = {day for _, day in rows}
+    previous = {}
+    for chunk in chunked({employee_id for employee_id, _ in rows}):
+        for employee_id, day, status in db.session.execute(
+            db.select(Attendance.employee_id, Attendance.date, Attendance.status).where(
+                Attendance.employee_id.in_(chunk),
+                Attendance.date.in_(dates)
+            )
+        ):
+            if (employee_id, day) in rows:
+                previous[(employee_id, day)] = status
+    
+    outcomes = {}
+    changes = []
+    for key, status in rows.items():
+        old_status = previous.get(key)
+        if old_status == status:
+            outcomes[key] = 'unchanged'
+            continue
+        outcomes[key] = 'updated' if key in previous else 'created'
+        changes.append((key[0], key[1], old_status, status))
+    
+    now = datetime.utcnow()
+    values = [{
+        'employee_id': employee_id,
+        'date': day,
+        'status': status,
+        'overtime_hours': 0,
+        'marked_by': marked_by,
+        'created_at': now,
+        'updated_at': now
+    } for employee_id, day, _, status in changes]
+    
+    for chunk in chunked(values, app.config['BULK_UPSERT_CHUNK_SIZE']):
+        stmt = build_attendance_upsert(chunk)
+        if stmt is not None:
+            db.session.execute(stmt)
+            continue
+        # No native upsert on this backend: fall back to per-row ORM writes
+        for row in chunk:
+            existing = Attendance.query.filter_by(employee_id=row['employee_id'], date=row['date']).first()
+            if existing:
+                existing.status = row['status']
+                existing.marked_by = marked_by
+            else:
+                db.session.add(Attendance(**row))
+    
+    update_monthly_summary(changes)
+    return outcomes
+
+def serialize_value(value):
+    """JSON-friendly form of a column value, matching the hand-written serializers"""
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value) if value else None
+    return value
+
+def encode_cursor(values):
+    """Opaque keyset cursor for the sort key values of the last row on a page"""
+    return base64.urlsafe_b64encode(json.dumps([serialize_value(v) for v in values]).encode()).decode('ascii')
+
+def decode_cursor(token, order_by):
+    """Turn a cursor back into typed sort key values; raises ValueError if it is malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+    except Exception:
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(order_by):
+        raise ValueError('Invalid cursor')
+    decoded = []
+    for value, (column, _) in zip(values, order_by):
+        # Crafted cursors can hold any JSON value; each one must match its sort column's type
+        try:
+            if isinstance(column.type, db.DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, db.Date):
+                value = date.fromisoformat(value)
+            elif isinstance(column.type, db.Integer):
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise TypeError(type(value).__name__)
+            elif isinstance(column.type, db.String):
+                if not isinstance(value, str):
+                    raise TypeError(type(value).__name__)
+            elif not isinstance(value, (int, float, str)):
+                raise TypeError(type(value).__name__)
+        except (TypeError, ValueError):
+            raise ValueError('Invalid cursor')
+        decoded.append(value)
+    return decoded
+
+def parse_listing_args(available_fields, default_fields):
+    """Read fields=, limit= and cursor= for a listing endpoint.
+    
+    Returns (fields, limit, cursor); limit is None when the caller did not ask for
+    pagination. Raises ValueError with a client-facing message on bad input.
+    """
+    fields_arg = request.args.get('fields')
+    fields = [f.strip() for f in fields_arg.split(',') if f.strip()] if fields_arg else list(default_fields)
+    unknown = [f for f in fields if f not in available_fields]
+    if unknown or not fields:
+        raise ValueError(f'Unknown fields: {unknown}. Available fields: {list(available_fields)}')
+    
+    limit = None
+    if 'limit' in request.args or 'cursor' in request.args:
+        limit = request.args.get('limit', app.config['LISTING_DEFAULT_PAGE_SIZE'], type=int)
+        if limit is None or limit < 1:
+            raise ValueError('limit must be a positive integer')
+        limit = min(limit, app.config['LISTING_MAX_PAGE_SIZE'])
+    return fields, limit, request.args.get('cursor')
+
+def parse_bool_arg(name):
+    """Optional true/false query parameter"""
+    value = request.args.get(name)
+    if value is None:
+        return None
+    if value.lower() not in ('true', 'false'):
+        raise ValueError(f'{name} must be true or false')
+    return value.lower() == 'true'
+
+def run_listing(columns, fields, order_by, limit, cursor, build_query):
+    """Run a projected listing query with optional keyset pagination.
+    
+    columns maps field names to column expressions and order_by is a list of
+    (column, descending) ending with a unique column. build_query receives the
+    selected columns and returns the filtered statement. Returns (items, next_cursor).
+    """
+    key_labels = [f'_sort_key_{i}' for i in range(len(order_by))]
+    stmt = build_query(
+        [columns[field].label(field) for field in fields] +
+        [column.label(label) for (column, _), label in zip(order_by, key_labels)]
+    )
+    
+    if cursor:
+        values = decode_cursor(cursor, order_by)
+        # Lexicographic "after the cursor" predicate: (a, b) > (x, y) => a > x OR (a = x AND b > y)
+        clauses = []
+        for i, (column, descending) in enumerate(order_by):
+            beyond = column < values[i] if descending else column > values[i]
+            clauses.append(and_(*[order_by[j][0] == values[j] for j in range(i)], beyond))
+        stmt = stmt.where(or_(*clauses))
+    
+    stmt = stmt.order_by(*[column.desc() if descending else column.asc() for column, descending in order_by])
+    if limit:
+        stmt = stmt.limit(limit + 1)
+    
+    rows = db.session.execute(stmt).mappings().all()
+    next_cursor = None
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor([rows[-1][label] for label in key_labels])
+    return [{field: serialize_value(row[field]) for field in fields} for row in rows], next_cursor
+
+def listing_response(items, limit, next_cursor):
+    """Plain list when unpaginated (original response shape), page envelope otherwise"""
+    if limit is None:
+        return jsonify(items)
+    return jsonify({'items': items, 'limit': limit, 'next_cursor': next_cursor})
+
 # JWT identity loader
 @jwt.user_identity_loader
 def user_identity_lookup(admin_id):
     return admin_id
 
+AdminPrincipal = namedtuple('AdminPrincipal', 'id username email full_name is_active')
+
+def load_admin_principal(admin_id):
+    """Resolve an admin through principal_cache; None when the admin does not exist"""
+    principal = principal_cache.get(admin_id)
+    if principal is None:
+        row = db.session.execute(
+            db.select(Admin.id, Admin.username, Admin.email, Admin.full_name, Admin.is_active).where(Admin.id == admin_id)
+        ).first()
+        if row is None:
+            return None
+        principal = AdminPrincipal(*row)
+        principal_cache.put(admin_id, principal)
+    return principal
+
 @jwt.user_lookup_loader
 def user_lookup_callback(_jwt_header, jwt_data):
-    identity = jwt_data["sub"]
-    return Admin.query.filter_by(id=int(identity)).one_or_none()
+    """Current user of a protected request; unknown or deactivated admins are rejected with 401"""
+    principal = load_admin_principal(int(jwt_data["sub"]))
+    if principal is None or not principal.is_active:
+        return None
+    return principal
+
+@jwt.user_lookup_error_loader
+def user_lookup_error_callback(_jwt_header, jwt_data):
+    return jsonify({'message': 'User not found or inactive'}), 401
 
 # Database Models
 class Admin(db.Model):
@@ -164,6 +1079,11 @@ class Admin(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
 
+@event.listens_for(Admin, 'after_update')
+@event.listens_for(Admin, 'after_delete')
+def invalidate_admin_principal(_mapper, _connection, admin):
+    principal_cache.invalidate(admin.id)
+
 class Department(db.Model):
     __tablename__ = 'departments'
     id = db.Column(db.Integer, primary_key=True)
@@ -192,6 +1112,11 @@ class Employee(db.Model):
     is_active = db.Column(db.Boolean, default=True, nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.Index('ix_employees_department_id', 'department_id'),
+        db.Index('ix_employees_is_active_id', 'is_active', 'id'),
+    )
 
 class Attendance(db.Model):
     __tablename__ = 'attendance'
@@ -211,7 +1136,47 @@ class Attendance(db.Model):
     employee = db.relationship('Employee', backref=db.backref('attendance_records', lazy=True))
     admin = db.relationship('Admin', backref=db.backref('marked_attendance', lazy=True))
     
-    __table_args__ = (db.UniqueConstraint('employee_id', 'date', name='unique_employee_date'),)
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'date', name='unique_employee_date'),
+        # Month/day range scans; covering so overview and validation never touch the table
+        db.Index('ix_attendance_date_employee_status', 'date', 'employee_id', 'status'),
+    )
+
+class AttendanceMonthlySummary(db.Model):
+    """Per-employee status counts for one month, maintained on every attendance write.
+    
+    Only weekdays (Mon-Fri) are counted; reports subtract holidays themselves since
+    those can change after attendance has been marked. Whole-month PDF exports read
+    their counts from here (load_summary_counts) instead of the day-level rows.
+    """
+    __tablename__ = 'attendance_monthly_summary'
+    id = db.Column(db.Integer, primary_key=True)
+    employee_id = db.Column(db.Integer, db.ForeignKey('employees.id'), nullable=False)
+    month = db.Column(db.Date, nullable=False)  # First day of the month
+    present_count = db.Column(db.Integer, default=0, nullable=False)
+    half_day_count = db.Column(db.Integer, default=0, nullable=False)
+    absent_count = db.Column(db.Integer, default=0, nullable=False)
+    leave_count = db.Column(db.Integer, default=0, nullable=False)
+    overtime_count = db.Column(db.Integer, default=0, nullable=False)
+    marked_count = db.Column(db.Integer, default=0, nullable=False)  # Any status, including unknown ones
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('employee_id', 'month', name='unique_employee_month'),
+        db.Index('ix_attendance_monthly_summary_month_employee', 'month', 'employee_id'),
+    )
+
+class AttendanceDailyCount(db.Model):
+    """Number of active employees with any status on a date, maintained on every attendance write"""
+    __tablename__ = 'attendance_daily_counts'
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, nullable=False)
+    marked_count = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('date', name='unique_attendance_daily_count_date'),
+    )
 
 class Leave(db.Model):
     __tablename__ = 'leaves'
@@ -230,6 +1195,12 @@ class Leave(db.Model):
     
     employee = db.relationship('Employee', backref=db.backref('leave_requests', lazy=True))
     approver = db.relationship('Admin', backref=db.backref('approved_leaves', lazy=True))
+    
+    __table_args__ = (
+        db.Index('ix_leaves_created_at', 'created_at'),
+        db.Index('ix_leaves_employee_id', 'employee_id'),
+        db.Index('ix_leaves_status_created_at', 'status', 'created_at'),
+    )
 
 class FileStorage(db.Model):
     __tablename__ = 'file_storage'
@@ -240,7 +1211,9 @@ class FileStorage(db.Model):
     file_size = db.Column(db.Integer, nullable=False)
     mime_type = db.Column(db.String(100), nullable=False)
     file_path = db.Column(db.String(500), nullable=False)
-    file_data = db.Column(db.LargeBinary, nullable=True)  # Store file content in database
+    file_data = db.deferred(db.Column(db.LargeBinary, nullable=True))  # Legacy in-database content, see content_hash
+    content_hash = db.Column(db.String(64), nullable=True)  # SHA-256 of the content in the file store
+    storage_backend = db.Column(db.String(20), nullable=True)
     description = db.Column(Text, nullable=True)
     related_table = db.Column(db.String(50), nullable=True)  # 'attendance', 'employee', 'report'
     related_id = db.Column(db.Integer, nullable=True)
@@ -248,6 +1221,70 @@ class FileStorage(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     uploader = db.relationship('Admin', backref=db.backref('uploaded_files', lazy=True))
+    
+    __table_args__ = (
+        db.Index('ix_file_storage_created_at', 'created_at'),
+        db.Index('ix_file_storage_file_type_created_at', 'file_type', 'created_at'),
+        db.Index('ix_file_storage_content_hash', 'content_hash'),
+    )
+
+class ExportJob(db.Model):
+    """A report rendered in the background; the finished file is linked through file_id"""
+    __tablename__ = 'export_jobs'
+    id = db.Column(db.Integer, primary_key=True)
+    export_format = db.Column(db.String(20), nullable=False)  # 'excel', 'pdf', 'csv', 'parquet'
+    period_start = db.Column(db.Date, nullable=False)
+    period_end = db.Column(db.Date, nullable=False)
+    status = db.Column(db.String(20), default='queued', nullable=False)  # 'queued', 'running', 'completed', 'failed'
+    file_id = db.Column(db.Integer, db.ForeignKey('file_storage.id'), nullable=True)
+    error = db.Column(Text, nullable=True)
+    requested_by = db.Column(db.Integer, db.ForeignKey('admin.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+    
+    file = db.relationship('FileStorage')
+    
+    __table_args__ = (
+        # In-flight lookup for deduplication of identical requests
+        db.Index('ix_export_jobs_lookup', 'export_format', 'period_start', 'period_end', 'status'),
+        db.Index('ix_export_jobs_status_created_at', 'status', 'created_at'),
+    )
+
+class ReportDataVersion(db.Model):
+    """Watermark bumped on every change that alters the reports of a scope (see bump_report_versions)"""
+    __tablename__ = 'report_data_versions'
+    id = db.Column(db.Integer, primary_key=True)
+    scope = db.Column(db.String(50), nullable=False)  # 'month:YYYY-MM' or 'employees'
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    __table_args__ = (
+        db.UniqueConstraint('scope', name='unique_report_data_version_scope'),
+    )
+
+class ReportCacheEntry(db.Model):
+    """A generated report, reused while the data version it was built from is current"""
+    __tablename__ = 'report_cache'
+    id = db.Column(db.Integer, primary_key=True)
+    report_format = db.Column(db.String(20), nullable=False)  # 'excel', 'excel_stream', 'pdf', 'csv', 'parquet'
+    month = db.Column(db.Date, nullable=False)  # first day of the period
+    period_end = db.Column(db.Date, nullable=False)
+    report_filter = db.Column(db.String(100), nullable=False, default='', server_default='')  # e.g. 'employee=5'
+    data_version = db.Column(db.String(50), nullable=False)
+    file_id = db.Column(db.Integer, db.ForeignKey('file_storage.id'), nullable=False)
+    file_size = db.Column(db.Integer, nullable=False)
+    hit_count = db.Column(db.Integer, default=0, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    last_used_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    file = db.relationship('FileStorage')
+    
+    __table_args__ = (
+        db.UniqueConstraint('report_format', 'month', 'period_end', 'report_filter', 'data_version',
+                            name='unique_report_cache_key'),
+        db.Index('ix_report_cache_last_used_at', 'last_used_at'),
+    )
 
 class Holiday(db.Model):
     __tablename__ = 'holidays'
@@ -262,7 +1299,10 @@ class Holiday(db.Model):
     
     creator = db.relationship('Admin', backref=db.backref('created_holidays', lazy=True))
     
-    __table_args__ = (db.UniqueConstraint('name', 'date', name='unique_holiday_name_date'),)
+    __table_args__ = (
+        db.UniqueConstraint('name', 'date', name='unique_holiday_name_date'),
+        db.Index('ix_holidays_date', 'date'),
+    )
 
 class AuditLog(db.Model):
     __tablename__ = 'audit_logs'
@@ -279,6 +1319,19 @@ class AuditLog(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     user = db.relationship('Admin', backref=db.backref('audit_logs', lazy=True))
+    
+    __table_args__ = (
+        db.Index('ix_audit_logs_created_at', 'created_at'),
+        db.Index('ix_audit_logs_table_record', 'table_name', 'record_id'),
+    )
+
+# Buffered audit log writer (drained on interpreter shutdown)
+audit_writer = AuditLogWriter(
+    AuditLog.__table__,
+    flush_interval=app.config['AUDIT_FLUSH_INTERVAL'],
+    batch_size=app.config['AUDIT_BATCH_SIZE'],
+    max_queue_size=app.config['AUDIT_QUEUE_SIZE']
+)
 
 # Routes
 @app.route('/')
@@ -336,8 +1389,7 @@ def admin_login():
 def verify_token_endpoint():
     """Test if JWT token is valid"""
     try:
-        current_user_id = get_jwt_identity()
-        admin = Admin.query.filter_by(id=int(current_user_id)).first()
+        admin = get_current_user()
         
         if admin and admin.is_active:
             return jsonify({
@@ -360,23 +1412,53 @@ def verify_token_endpoint():
 @app.route('/admin/employees', methods=['GET'])
 @jwt_required()
 def get_employees():
-    employees = Employee.query.all()
-    return jsonify([{
-        'id': emp.id,
-        'employee_id': emp.employee_id,
-        'name': emp.name,
-        'email': emp.email,
-        'phone': emp.phone,
-        'address': emp.address,
-        'department_id': emp.department_id,
-        'department_name': emp.department.name if emp.department else None,
-        'position': emp.position,
-        'hire_date': emp.hire_date.isoformat() if emp.hire_date else None,
-        'salary': float(emp.salary) if emp.salary else None,
-        'is_active': emp.is_active,
-        'created_at': emp.created_at.isoformat(),
-        'updated_at': emp.updated_at.isoformat()
-    } for emp in employees])
+    """List employees.
+    
+    Optional query parameters: fields=a,b (projection), department_id, active=true|false,
+    q (name/email/employee ID search), and limit/cursor for keyset pagination by id.
+    """
+    columns = {
+        'id': Employee.id,
+        'employee_id': Employee.employee_id,
+        'name': Employee.name,
+        'email': Employee.email,
+        'phone': Employee.phone,
+        'address': Employee.address,
+        'department_id': Employee.department_id,
+        'department_name': Department.name,
+        'position': Employee.position,
+        'hire_date': Employee.hire_date,
+        'salary': Employee.salary,
+        'is_active': Employee.is_active,
+        'created_at': Employee.created_at,
+        'updated_at': Employee.updated_at
+    }
+    try:
+        fields, limit, cursor = parse_listing_args(columns, columns)
+        department_id = request.args.get('department_id', type=int)
+        active = parse_bool_arg('active')
+        search = request.args.get('q', '').strip()
+        
+        def build_query(selected):
+            stmt = db.select(*selected).select_from(Employee)
+            if 'department_name' in fields:
+                stmt = stmt.outerjoin(Department, Employee.department_id == Department.id)
+            if department_id is not None:
+                stmt = stmt.where(Employee.department_id == department_id)
+            if active is not None:
+                stmt = stmt.where(Employee.is_active == active)
+            if search:
+                pattern = f'%{search}%'
+                stmt = stmt.where(or_(
+                    Employee.name.ilike(pattern), Employee.email.ilike(pattern), Employee.employee_id.ilike(pattern)
+                ))
+            return stmt
+        
+        items, next_cursor = run_listing(columns, fields, [(Employee.id, False)], limit, cursor, build_query)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return listing_response(items, limit, next_cursor)
 
 @app.route('/admin/employees', methods=['POST'])
 @jwt_required()
@@ -436,6 +1518,7 @@ def add_employee():
             salary=salary
         )
         db.session.add(employee)
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -504,6 +1587,7 @@ def update_employee(employee_id):
             except ValueError:
                 return jsonify({'message': 'Invalid hire_date format. Use YYYY-MM-DD'}), 400
         
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -541,11 +1625,180 @@ def update_employee(employee_id):
 @jwt_required()
 def delete_employee(employee_id):
     employee = Employee.query.get_or_404(employee_id)
+    if employee.is_active:
+        remove_employee_from_daily_counts(employee.id)
+    AttendanceMonthlySummary.query.filter_by(employee_id=employee.id).delete()
     db.session.delete(employee)
+    bump_report_versions([REPORT_EMPLOYEES_SCOPE])
     db.session.commit()
     
     return jsonify({'message': 'Employee deleted successfully'})
 
+def period_start_expression(column, unit):
+    """SQL expression for the first day of the ISO week (Monday) or month containing a date column"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        expression = (db.func.date(column, 'weekday 0', '-6 days') if unit == 'week'
+                      else db.func.date(column, 'start of month'))
+    elif dialect in ('mysql', 'mariadb'):
+        expression = (db.func.subdate(column, db.func.weekday(column)) if unit == 'week'
+                      else db.func.subdate(column, db.func.dayofmonth(column) - 1))
+    else:
+        expression = db.cast(db.func.date_trunc(unit, column), db.Date)
+    return db.type_coerce(expression, db.Date)
+
+def employee_rollup_statement(employee_id, first_day, last_day, non_working_days=()):
+    """One employee's attendance grouped by (week, month, status), with window totals
+    
+    The inner query reads the employee's rows through the (employee_id, date) index and
+    tags each with its week start, month start and whether it falls on a working day.
+    Each grouped row then carries its week's and month's totals (per status for day
+    counts, over all statuses for hours) and the whole range's per-status totals.
+    """
+    rows = db.select(
+        Attendance.status,
+        Attendance.total_hours,
+        Attendance.overtime_hours,
+        period_start_expression(Attendance.date, 'week').label('week_start'),
+        period_start_expression(Attendance.date, 'month').label('month_start'),
+        db.case((Attendance.date.in_(list(non_working_days)), 0), else_=1).label('working')
+    ).where(
+        Attendance.employee_id == employee_id,
+        Attendance.date >= first_day,
+        Attendance.date <= last_day
+    ).subquery()
+    
+    working_days = db.func.sum(rows.c.working)
+    hours = db.func.coalesce(db.func.sum(rows.c.total_hours), 0)
+    overtime = db.func.coalesce(db.func.sum(rows.c.overtime_hours), 0)
+    return db.select(
+        rows.c.week_start,
+        rows.c.month_start,
+        rows.c.status,
+        db.func.sum(working_days).over(partition_by=[rows.c.week_start, rows.c.status]).label('week_days'),
+        db.func.sum(hours).over(partition_by=rows.c.week_start).label('week_hours'),
+        db.func.sum(overtime).over(partition_by=rows.c.week_start).label('week_overtime'),
+        db.func.sum(working_days).over(partition_by=[rows.c.month_start, rows.c.status]).label('month_days'),
+        db.func.sum(hours).over(partition_by=rows.c.month_start).label('month_hours'),
+        db.func.sum(overtime).over(partition_by=rows.c.month_start).label('month_overtime'),
+        db.func.sum(working_days).over(partition_by=rows.c.status).label('range_days'),
+        db.func.sum(hours).over().label('range_hours'),
+        db.func.sum(overtime).over().label('range_overtime')
+    ).group_by(
+        rows.c.week_start, rows.c.month_start, rows.c.status
+    )
+
+def attendance_rollup(first_day, last_day, working_mask):
+    """Empty rollup of a (clipped) period; status counts only cover working days"""
+    working_days = int(working_mask.sum())
+    return {
+        'start_date': first_day.isoformat(),
+        'end_date': last_day.isoformat(),
+        'working_days': working_days,
+        'status_counts': dict.fromkeys(ATTENDANCE_STATUSES, 0),
+        'marked_days': 0,
+        'not_marked': working_days,
+        'total_hours': 0.0,
+        'overtime_hours': 0.0,
+        'attendance_percentage': 0.0
+    }
+
+def apply_rollup_row(rollup, status, days, hours, overtime):
+    """Add one status's working-day count to a rollup and set its (all-status) hour totals"""
+    if status in rollup['status_counts']:
+        rollup['status_counts'][status] = int(days or 0)
+    rollup['marked_days'] += int(days or 0)
+    rollup['not_marked'] = rollup['working_days'] - rollup['marked_days']
+    rollup['total_hours'] = float(hours or 0)
+    rollup['overtime_hours'] = float(overtime or 0)
+    if rollup['working_days']:
+        rollup['attendance_percentage'] = round(rollup['status_counts']['present'] * 100.0 / rollup['working_days'], 1)
+
+@app.route('/admin/employees/<int:employee_id>/attendance-stats', methods=['GET'])
+@jwt_required()
+def get_employee_attendance_stats(employee_id):
+    """Daily, weekly (ISO weeks) and monthly attendance rollups of one employee
+    
+    The period is start_date/end_date (up to EMPLOYEE_STATS_MAX_RANGE_DAYS) or the month
+    of month/date, the current month stopping at today. Status counts and attendance %
+    (present / working days) cover working days; hours cover every marked day.
+    """
+    employee = db.session.get(Employee, employee_id)
+    if employee is None:
+        return jsonify({'message': 'Employee not found'}), 404
+    try:
+        first_day, last_day = parse_period_args(app.config['EMPLOYEE_STATS_MAX_RANGE_DAYS'])
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    try:
+        holiday_names = dict(db.session.execute(
+            db.select(Holiday.date, Holiday.name).where(Holiday.date >= first_day, Holiday.date <= last_day)
+        ).all())
+        days = period_days(first_day, last_day)
+        weekend_mask, holiday_mask, working_mask = day_masks(days, holiday_names)
+        non_working_days = [day for day, working in zip(days, working_mask) if not working]
+        
+        # Calendar buckets first, so weeks and months without any marks are reported too
+        weekly, monthly = {}, {}
+        for buckets, start_of in ((weekly, lambda day: day - timedelta(days=day.weekday())),
+                                  (monthly, lambda day: day.replace(day=1))):
+            for bucket_start, indices in groupby(range(len(days)), key=lambda index: start_of(days[index])):
+                indices = list(indices)
+                buckets[bucket_start] = attendance_rollup(days[indices[0]], days[indices[-1]],
+                                                          working_mask[indices[0]:indices[-1] + 1])
+        totals = attendance_rollup(first_day, last_day, working_mask)
+        
+        # A week spanning two months comes back in two groups carrying the same week totals
+        applied = set()
+        for row in db.session.execute(employee_rollup_statement(employee_id, first_day, last_day, non_working_days)):
+            for key, rollup, days_count, hours, overtime in (
+                (('week', row.week_start), weekly[row.week_start], row.week_days, row.week_hours, row.week_overtime),
+                (('month', row.month_start), monthly[row.month_start], row.month_days, row.month_hours, row.month_overtime),
+                (('range',), totals, row.range_days, row.range_hours, row.range_overtime),
+            ):
+                if key + (row.status,) not in applied:
+                    applied.add(key + (row.status,))
+                    apply_rollup_row(rollup, row.status, days_count, hours, overtime)
+        
+        marks = {day: (status, total_hours, overtime_hours) for day, status, total_hours, overtime_hours in db.session.execute(
+            db.select(Attendance.date, Attendance.status, Attendance.total_hours, Attendance.overtime_hours).where(
+                Attendance.employee_id == employee_id,
+                Attendance.date >= first_day,
+                Attendance.date <= last_day
+            )
+        )}
+    except Exception as e:
+        print(f"Employee attendance stats error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+    
+    daily = []
+    for day, is_weekend, is_working in zip(days, weekend_mask, working_mask):
+        status, total_hours, overtime_hours = marks.get(day, ('not_marked', None, None))
+        daily.append({
+            'date': day.isoformat(),
+            'status': status,
+            'total_hours': float(total_hours) if total_hours is not None else None,
+            'overtime_hours': float(overtime_hours) if overtime_hours is not None else None,
+            'is_weekend': bool(is_weekend),
+            'holiday': holiday_names.get(day),
+            'is_working_day': bool(is_working)
+        })
+    
+    return jsonify({
+        'employee': {
+            'id': employee.id,
+            'name': employee.name,
+            'department_id': employee.department_id,
+            'is_active': employee.is_active
+        },
+        'period': {'start_date': first_day.isoformat(), 'end_date': last_day.isoformat()},
+        'totals': totals,
+        'daily': daily,
+        'weekly': list(weekly.values()),
+        'monthly': list(monthly.values())
+    })
+
 @app.route('/admin/attendance', methods=['POST'])
 @jwt_required()
 def mark_attendance():
@@ -573,6 +1826,7 @@ def mark_attendance():
         date=date_obj
     ).first()
     
+    old_status = existing_attendance.status if existing_attendance else None
     if existing_attendance:
         existing_attendance.status = status
     else:
@@ -583,6 +1837,7 @@ def mark_attendance():
         )
         db.session.add(attendance)
     
+    update_monthly_summary([(employee_id, date_obj, old_status, status)])
     db.session.commit()
     
     return jsonify({'message': 'Attendance marked successfully'})
@@ -638,6 +1893,11 @@ def get_attendance_report():
 @app.route('/admin/attendance/bulk', methods=['POST'])
 @jwt_required()
 def bulk_mark_attendance():
+    """Upsert attendance for many employees on one date.
+    
+    Rows are validated up front and written with a set-based upsert; employees not in
+    the payload keep their records. Each input row gets an outcome in 'results'.
+    """
     data = request.get_json()
     attendance_data = data.get('attendance_data', [])
     date_str = data.get('date', datetime.now().date().isoformat())
@@ -651,21 +1911,167 @@ def bulk_mark_attendance():
     if not attendance_data:
         return jsonify({'message': 'Attendance data is required'}), 400
     
-    # Clear existing attendance for this date
-    Attendance.query.filter_by(date=date_obj).delete()
+    # Validate every row before writing anything
+    results = []
+    valid_rows = {}
+    for index, record in enumerate(attendance_data):
+        result = {'index': index, 'employee_id': record.get('employee_id'), 'status': record.get('status')}
+        results.append(result)
+        try:
+            employee_id = int(record.get('employee_id'))
+        except (TypeError, ValueError):
+            result.update(result='rejected', message='Invalid employee ID')
+            continue
+        if record.get('status') not in ATTENDANCE_STATUSES:
+            result.update(result='rejected', message=f'Status must be one of: {list(ATTENDANCE_STATUSES)}')
+        elif employee_id in valid_rows:
+            result.update(result='rejected', message='Duplicate employee ID in request')
+        else:
+            result['employee_id'] = employee_id
+            valid_rows[employee_id] = result
     
-    # Add new attendance records
-    for record in attendance_data:
-        attendance = Attendance(
-            employee_id=record['employee_id'],
-            date=date_obj,
-            status=record['status']
+    known_employees = set()
+    for chunk in chunked(valid_rows):
+        known_employees.update(db.session.execute(db.select(Employee.id).where(Employee.id.in_(chunk))).scalars())
+    for employee_id in list(valid_rows):
+        if employee_id not in known_employees:
+            valid_rows.pop(employee_id).update(result='rejected', message='Employee not found')
+    
+    if not valid_rows:
+        return jsonify({'message': 'No valid attendance records provided', 'results': results}), 400
+    
+    try:
+        outcomes = upsert_attendance_rows(
+            ((employee_id, date_obj, result['status']) for employee_id, result in valid_rows.items()),
+            marked_by=int(get_jwt_identity())
         )
-        db.session.add(attendance)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Bulk attendance error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
     
-    db.session.commit()
+    for employee_id, result in valid_rows.items():
+        result['result'] = outcomes[(employee_id, date_obj)]
+    
+    counts = dict.fromkeys(('created', 'updated', 'unchanged', 'rejected'), 0)
+    for result in results:
+        counts[result['result']] += 1
+    
+    return jsonify({
+        'message': 'Bulk attendance marked successfully',
+        'date': date_obj.isoformat(),
+        'counts': counts,
+        'results': results
+    })
+
+def parse_marking_dates(data):
+    """Sorted, de-duplicated dates of a range marking request: 'dates' or 'start_date'..'end_date'
+
+    Raises ValueError with a client-facing message on bad input.
+    """
+    def parse_date(value):
+        try:
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            raise ValueError('Invalid date format. Use YYYY-MM-DD')
+    
+    if data.get('dates') is not None:
+        if data.get('start_date') or data.get('end_date'):
+            raise ValueError('Give either dates or start_date/end_date, not both')
+        if not isinstance(data['dates'], list):
+            raise ValueError('dates must be a list of YYYY-MM-DD strings')
+        days = sorted({parse_date(value) for value in data['dates']})
+    elif data.get('start_date') and data.get('end_date'):
+        first_day, last_day = parse_date(data['start_date']), parse_date(data['end_date'])
+        if last_day < first_day:
+            raise ValueError('end_date must not be before start_date')
+        days = period_days(first_day, last_day)
+    else:
+        raise ValueError('dates or start_date and end_date are required')
+    
+    max_days = app.config['ATTENDANCE_RANGE_MAX_DAYS']
+    if not days:
+        raise ValueError('No dates selected')
+    if (days[-1] - days[0]).days + 1 > max_days:
+        raise ValueError(f'Dates cannot span more than {max_days} days')
+    return days
+
+@app.route('/admin/attendance/range', methods=['POST'])
+@jwt_required()
+def mark_attendance_range():
+    """Mark one status for one or more employees on a set of dates or a date range.
+    
+    Body: employee_id or employee_ids, status, and dates (list) or start_date/end_date;
+    skip_weekends and skip_holidays leave those days untouched. Everything is written
+    in one transaction by the set-based upsert used for bulk marking.
+    """
+    data = request.get_json() or {}
+    status = data.get('status')
+    if status not in ATTENDANCE_STATUSES:
+        return jsonify({'message': f'Status must be one of: {list(ATTENDANCE_STATUSES)}'}), 400
+    
+    raw_ids = data.get('employee_ids') if data.get('employee_ids') is not None else [data.get('employee_id')]
+    try:
+        if not isinstance(raw_ids, list) or not raw_ids:
+            raise ValueError
+        employee_ids = sorted({int(employee_id) for employee_id in raw_ids})
+    except (TypeError, ValueError):
+        return jsonify({'message': 'employee_id or a non-empty list of employee_ids is required'}), 400
+    
+    try:
+        days = parse_marking_dates(data)
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    for flag in ('skip_weekends', 'skip_holidays'):
+        if not isinstance(data.get(flag, False), bool):
+            return jsonify({'message': f'{flag} must be true or false'}), 400
+    
+    skipped = {}
+    if data.get('skip_weekends'):
+        skipped.update((day, 'weekend') for day in days if day.weekday() >= 5)
+    if data.get('skip_holidays'):
+        selected = set(days)
+        skipped.update((day, 'holiday') for day in db.session.execute(
+            db.select(Holiday.date).where(Holiday.date >= days[0], Holiday.date <= days[-1])
+        ).scalars() if day in selected)
+    marked_days = [day for day in days if day not in skipped]
     
-    return jsonify({'message': 'Bulk attendance marked successfully'})
+    max_records = app.config['ATTENDANCE_RANGE_MAX_RECORDS']
+    if len(employee_ids) * len(marked_days) > max_records:
+        return jsonify({'message': f'At most {max_records} attendance records can be marked per request'}), 400
+    
+    known_employees = set()
+    for chunk in chunked(employee_ids):
+        known_employees.update(db.session.execute(db.select(Employee.id).where(Employee.id.in_(chunk))).scalars())
+    missing = [employee_id for employee_id in employee_ids if employee_id not in known_employees]
+    if missing:
+        return jsonify({'message': 'Employee not found', 'employee_ids': missing}), 404
+    
+    try:
+        outcomes = upsert_attendance_rows(
+            ((employee_id, day, status) for employee_id in employee_ids for day in marked_days),
+            marked_by=int(get_jwt_identity())
+        )
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print(f"Range attendance error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+    
+    counts = dict.fromkeys(('created', 'updated', 'unchanged'), 0)
+    for outcome in outcomes.values():
+        counts[outcome] += 1
+    
+    return jsonify({
+        'message': 'Attendance marked successfully',
+        'status': status,
+        'employee_ids': employee_ids,
+        'dates': [day.isoformat() for day in marked_days],
+        'skipped': [{'date': day.isoformat(), 'reason': reason} for day, reason in sorted(skipped.items())],
+        'counts': counts
+    })
 
 @app.route('/admin/attendance/<int:employee_id>/<string:date>', methods=['DELETE'])
 @jwt_required()
@@ -686,6 +2092,7 @@ def delete_attendance_record(employee_id, date):
         
         if attendance_record:
             db.session.delete(attendance_record)
+            update_monthly_summary([(employee_id, date_obj, attendance_record.status, None)])
             db.session.commit()
             
             # Log the action
@@ -716,6 +2123,7 @@ def clear_attendance_by_date(date):
         
         # Delete all attendance records for the date
         Attendance.query.filter_by(date=date_obj).delete()
+        update_monthly_summary((record.employee_id, date_obj, record.status, None) for record in records_to_delete)
         
         db.session.commit()
         
@@ -760,6 +2168,12 @@ def clear_monthly_attendance(date):
             Attendance.date >= first_day,
             Attendance.date <= last_day
         ).delete()
+        AttendanceMonthlySummary.query.filter_by(month=first_day).delete()
+        AttendanceDailyCount.query.filter(
+            AttendanceDailyCount.date >= first_day,
+            AttendanceDailyCount.date <= last_day
+        ).delete()
+        bump_report_versions([report_month_scope(first_day)])
         
         db.session.commit()
         
@@ -780,10 +2194,19 @@ def clear_monthly_attendance(date):
 
 @app.route('/admin/attendance/overview', methods=['GET'])
 @jwt_required()
+@cached_json_response(overview_cache_scopes)
 def get_attendance_overview():
-    """Get monthly attendance overview for all employees"""
+    """Get monthly attendance overview for all employees
+    
+    format=matrix returns a dense employee x day status-code matrix instead of the nested
+    dict; add encoding=base64 to receive it as one packed byte string.
+    """
     try:
         date_str = request.args.get('date', datetime.now().date().isoformat())
+        response_format = request.args.get('format', 'nested')
+        encoding = request.args.get('encoding', 'int')
+        if response_format not in ('nested', 'matrix') or encoding not in ('int', 'base64'):
+            return jsonify({'error': 'format must be nested or matrix and encoding int or base64'}), 400
         
         # Convert to date object and get month boundaries
         date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
@@ -794,7 +2217,36 @@ def get_attendance_overview():
             last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
         
         # Get all active employees
-        employees = Employee.query.filter_by(is_active=True).all()
+        employees = Employee.query.options(joinedload(Employee.department)).filter_by(is_active=True).all()
+        employees_data = [{
+            'id': emp.id,
+            'employee_id': emp.employee_id,
+            'name': emp.name,
+            'email': emp.email,
+            'department': emp.department.name if emp.department else None
+        } for emp in employees]
+        
+        if response_format == 'matrix':
+            employee_ids = [emp.id for emp in employees]
+            matrix = build_attendance_matrix(employee_ids, first_day, last_day)
+            day_count = (last_day - first_day).days + 1
+            if encoding == 'base64':
+                matrix_data = base64.b64encode(matrix).decode('ascii')
+            else:
+                matrix_data = [list(matrix[row:row + day_count]) for row in range(0, len(matrix), day_count)]
+            
+            return jsonify({
+                'month': first_day.strftime('%Y-%m'),
+                'first_day': first_day.isoformat(),
+                'last_day': last_day.isoformat(),
+                'format': 'matrix',
+                'encoding': encoding,
+                'shape': [len(employee_ids), day_count],
+                'status_codes': list(ATTENDANCE_STATUS_CODES),
+                'employee_ids': employee_ids,
+                'employees': employees_data,
+                'matrix': matrix_data
+            })
         
         # Get all attendance records for the month
         attendance_records = Attendance.query.filter(
@@ -817,13 +2269,7 @@ def get_attendance_overview():
             'month': first_day.strftime('%Y-%m'),
             'first_day': first_day.isoformat(),
             'last_day': last_day.isoformat(),
-            'employees': [{
-                'id': emp.id,
-                'employee_id': emp.employee_id,
-                'name': emp.name,
-                'email': emp.email,
-                'department': emp.department.name if emp.department else None
-            } for emp in employees],
+            'employees': employees_data,
             'attendance_data': attendance_dict
         })
         
@@ -831,161 +2277,773 @@ def get_attendance_overview():
         print(f"Attendance overview error: {e}")
         return jsonify({'error': 'Failed to fetch attendance overview'}), 500
 
-@app.route('/admin/test-token', methods=['GET'])
-@jwt_required()
-def test_token():
-    """Test endpoint to verify JWT token"""
-    current_user_id = get_jwt_identity()
-    return jsonify({
-        'message': 'Token is valid',
-        'user_id': current_user_id
-    })
+@app.route('/admin/test-token', methods=['GET'])
+@jwt_required()
+def test_token():
+    """Test endpoint to verify JWT token"""
+    current_user_id = get_jwt_identity()
+    return jsonify({
+        'message': 'Token is valid',
+        'user_id': current_user_id
+    })
+
+@app.route('/admin/cache/stats', methods=['GET'])
+@jwt_required()
+def get_cache_stats():
+    """Hit/miss counters of this server process's in-memory caches"""
+    return jsonify({
+        'pid': os.getpid(),
+        'response_cache': response_cache.stats(),
+        'principal_cache': principal_cache.stats()
+    })
+
+MISSING_ATTENDANCE_ORDER = [(Employee.id, 'asc'), (Attendance.date, 'asc')]
+
+def iter_missing_attendance(days, after=None, batch_size=200):
+    """Yield (employee_id, name, date) for active employees without a mark on one of days.
+    
+    Ordered by employee id, then date, starting after the (employee_id, date) pair in
+    after. Employees are read in keyset batches only as far as the caller consumes.
+    """
+    if not days:
+        return
+    last_id = None
+    while True:
+        stmt = db.select(Employee.id, Employee.name).where(Employee.is_active == True)
+        if last_id is not None:
+            stmt = stmt.where(Employee.id > last_id)
+        elif after is not None:
+            stmt = stmt.where(Employee.id >= after[0])
+        batch = db.session.execute(stmt.order_by(Employee.id).limit(batch_size)).all()
+        if not batch:
+            return
+        
+        marked = set(db.session.execute(
+            db.select(Attendance.employee_id, Attendance.date).where(
+                Attendance.employee_id.in_([employee_id for employee_id, _ in batch]),
+                Attendance.date.in_(days)
+            )
+        ).all())
+        for employee_id, employee_name in batch:
+            for day in days:
+                if (employee_id, day) not in marked and (after is None or (employee_id, day) > after):
+                    yield employee_id, employee_name, day
+        last_id = batch[-1][0]
+
+@app.route('/admin/attendance/validate', methods=['GET'])
+@jwt_required()
+def validate_attendance_completion():
+    """Validate if all attendance is marked for the specified month up to today
+    
+    Totals come from attendance_daily_counts; missing entries are paged with
+    missing_limit (default 10) and missing_cursor.
+    """
+    try:
+        date_str = request.args.get('date', datetime.now().date().isoformat())
+        
+        # Convert string date to date object
+        if isinstance(date_str, str):
+            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
+        else:
+            date_obj = date_str
+            
+        # Get first day of the month
+        first_day = date_obj.replace(day=1)
+        today = datetime.now().date()
+        
+        # Only validate up to today if we're in the current month
+        if first_day.year == today.year and first_day.month == today.month:
+            last_day = today
+        else:
+            # For past/future months, get the last day of that month
+            if first_day.month == 12:
+                last_day = first_day.replace(year=first_day.year + 1, month=1, day=1) - timedelta(days=1)
+            else:
+                last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
+        
+        try:
+            missing_limit = min(max(request.args.get('missing_limit', 10, type=int), 1),
+                                app.config['LISTING_MAX_PAGE_SIZE'])
+            missing_cursor = request.args.get('missing_cursor')
+            missing_after = tuple(decode_cursor(missing_cursor, MISSING_ATTENDANCE_ORDER)) if missing_cursor else None
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Invalid missing_limit or missing_cursor'}), 400
+        
+        # Working days exclude weekends and holidays (same masks as the report engine)
+        holiday_dates = db.session.execute(
+            db.select(Holiday.date).where(Holiday.date >= first_day, Holiday.date <= last_day)
+        ).scalars().all()
+        days = period_days(first_day, last_day)
+        working_days = [day for day, working in zip(days, day_masks(days, holiday_dates)[2]) if working]
+        
+        # O(days): per-day marked counts of active employees against the active headcount
+        headcount = db.session.query(db.func.count(Employee.id)).filter(Employee.is_active == True).scalar()
+        daily_marked = dict(db.session.query(AttendanceDailyCount.date, AttendanceDailyCount.marked_count).filter(
+            AttendanceDailyCount.date >= first_day,
+            AttendanceDailyCount.date <= last_day
+        ))
+        total_expected_records = headcount * len(working_days)
+        actual_records = sum(daily_marked.get(day, 0) for day in working_days)
+        missing_count = total_expected_records - actual_records
+        
+        # Missing entries are only looked up for incomplete days, one page at a time
+        incomplete_days = [day for day in working_days if daily_marked.get(day, 0) < headcount]
+        missing_attendance = []
+        missing_next_cursor = None
+        for employee_id, employee_name, work_day in iter_missing_attendance(incomplete_days, missing_after):
+            if len(missing_attendance) == missing_limit:
+                missing_next_cursor = encode_cursor(last_missing)
+                break
+            last_missing = (employee_id, work_day)
+            missing_attendance.append({
+                'employee_id': employee_id,
+                'employee_name': employee_name,
+                'date': work_day.isoformat(),
+                'date_formatted': work_day.strftime('%B %d, %Y')
+            })
+        
+        completion_percentage = (actual_records / total_expected_records * 100) if total_expected_records > 0 else 100
+        
+        return jsonify({
+            'is_complete': missing_count == 0,
+            'total_expected': total_expected_records,
+            'total_marked': actual_records,
+            'missing_count': missing_count,
+            'completion_percentage': round(completion_percentage, 1),
+            'missing_attendance': missing_attendance,  # First page only; follow missing_next_cursor for more
+            'missing_next_cursor': missing_next_cursor,
+            'period': {
+                'start_date': first_day.isoformat(),
+                'end_date': last_day.isoformat(),
+                'month_name': first_day.strftime('%B %Y')
+            },
+            'working_days_count': len(working_days),
+            'employees_count': headcount
+        })
+        
+    except Exception as e:
+        print(f"Attendance validation error: {e}")
+        return jsonify({'error': f'Failed to validate attendance: {str(e)}'}), 500
+
+def dashboard_cache_scopes():
+    day = datetime.strptime(request.args.get('date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+    return [report_month_scope(day), REPORT_EMPLOYEES_SCOPE, HOLIDAYS_SCOPE]
+
+@app.route('/admin/dashboard/summary', methods=['GET'])
+@jwt_required()
+@cached_json_response(dashboard_cache_scopes, ttl=lambda: app.config['DASHBOARD_CACHE_TTL'])
+def get_dashboard_summary():
+    """Counts for the dashboard: the day's headcount by status and department, employee
+    totals, pending leaves and month-to-date completion, each from a grouped aggregate
+    
+    Served from the response cache; attendance, employee and holiday writes invalidate it
+    at once, leave changes show up within DASHBOARD_CACHE_TTL seconds.
+    """
+    try:
+        date_obj = datetime.strptime(request.args.get('date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+    
+    try:
+        employee_totals = dict(db.session.execute(
+            db.select(Employee.is_active, db.func.count(Employee.id)).group_by(Employee.is_active)
+        ).all())
+        
+        # Active employees per department and status on the day (status None = not marked)
+        departments = {}
+        status_totals = dict.fromkeys(ATTENDANCE_STATUSES, 0)
+        not_marked = 0
+        for department_id, department_name, status, count in db.session.execute(
+            db.select(Department.id, Department.name, Attendance.status, db.func.count(Employee.id))
+            .select_from(Employee)
+            .outerjoin(Department, Employee.department_id == Department.id)
+            .outerjoin(Attendance, and_(Attendance.employee_id == Employee.id, Attendance.date == date_obj))
+            .where(Employee.is_active == True)
+            .group_by(Department.id, Department.name, Attendance.status)
+        ):
+            department = departments.setdefault(department_id, {
+                'id': department_id,
+                'name': department_name or 'No Department',
+                'active_employees': 0,
+                'status_counts': dict.fromkeys(ATTENDANCE_STATUSES, 0),
+                'not_marked': 0
+            })
+            department['active_employees'] += count
+            if status is None:
+                department['not_marked'] += count
+                not_marked += count
+            else:
+                # Unrecognised stored statuses are counted as marked but not broken out
+                if status in department['status_counts']:
+                    department['status_counts'][status] += count
+                    status_totals[status] += count
+        
+        pending_leaves = db.session.query(db.func.count(Leave.id)).filter(Leave.status == 'pending').scalar()
+        
+        # Month to date, as /admin/attendance/validate counts it: marks by active employees on working days
+        first_day = date_obj.replace(day=1)
+        holiday_dates = db.session.execute(
+            db.select(Holiday.date).where(Holiday.date >= first_day, Holiday.date <= date_obj)
+        ).scalars().all()
+        days = period_days(first_day, date_obj)
+        working_days = [day for day, working in zip(days, day_masks(days, holiday_dates)[2]) if working]
+        daily_marked = dict(db.session.execute(
+            db.select(AttendanceDailyCount.date, AttendanceDailyCount.marked_count).where(
+                AttendanceDailyCount.date >= first_day,
+                AttendanceDailyCount.date <= date_obj
+            )
+        ).all())
+    except Exception as e:
+        print(f"Dashboard summary error: {e}")
+        return jsonify({'message': 'Internal server error'}), 500
+    
+    active_employees = employee_totals.get(True, 0)
+    marked_today = active_employees - not_marked
+    expected_records = active_employees * len(working_days)
+    marked_records = sum(daily_marked.get(day, 0) for day in working_days)
+    
+    return jsonify({
+        'date': date_obj.isoformat(),
+        'employees': {
+            'active': active_employees,
+            'inactive': employee_totals.get(False, 0),
+            'total': sum(employee_totals.values())
+        },
+        'today': {
+            'status_counts': status_totals,
+            'marked': marked_today,
+            'not_marked': not_marked,
+            'attendance_rate': round(status_totals['present'] / active_employees * 100, 1) if active_employees else 0
+        },
+        'departments': sorted(departments.values(), key=lambda d: (d['id'] is None, d['name'])),
+        'pending_leaves': pending_leaves,
+        'month_to_date': {
+            'start_date': first_day.isoformat(),
+            'end_date': date_obj.isoformat(),
+            'working_days_count': len(working_days),
+            'expected_records': expected_records,
+            'marked_records': marked_records,
+            'completion_percentage': round(marked_records / expected_records * 100, 1) if expected_records else 100
+        }
+    })
+
+# Export filters: employee_id selects one employee (active or not), department_id the
+# active employees of a department; no filter means every active employee
+ExportFilter = namedtuple('ExportFilter', 'employee_id department_id', defaults=(None, None))
+
+def export_employee_criteria(export_filter):
+    """WHERE clauses on Employee selecting the employees an export covers"""
+    if export_filter and export_filter.employee_id is not None:
+        criteria = [Employee.id == export_filter.employee_id]
+    else:
+        criteria = [Employee.is_active == True]
+    if export_filter and export_filter.department_id is not None:
+        criteria.append(Employee.department_id == export_filter.department_id)
+    return criteria
+
+def export_attendance_criteria(export_filter):
+    """WHERE clauses on Attendance limiting a period's marks to the filtered employees"""
+    if export_filter and export_filter.employee_id is not None:
+        return [Attendance.employee_id == export_filter.employee_id]
+    if export_filter and export_filter.department_id is not None:
+        return [Attendance.employee_id.in_(
+            db.select(Employee.id).where(Employee.department_id == export_filter.department_id)
+        )]
+    return []
+
+def export_filter_key(export_filter):
+    """Report cache key of a filter, e.g. 'employee=5' ('' when unfiltered)"""
+    if not export_filter:
+        return ''
+    parts = []
+    if export_filter.employee_id is not None:
+        parts.append(f"employee={export_filter.employee_id}")
+    if export_filter.department_id is not None:
+        parts.append(f"department={export_filter.department_id}")
+    return '&'.join(parts)
+
+def is_calendar_month(first_day, last_day):
+    return first_day.day == 1 and (last_day.year, last_day.month) == (first_day.year, first_day.month)
+
+def export_subject(first_day, last_day, export_filter=None):
+    """What an export covers, for titles and audit messages, e.g. 'Jane Doe, September 2026'"""
+    if is_calendar_month(first_day, last_day):
+        period = first_day.strftime('%B %Y')
+    else:
+        period = f"{first_day.strftime('%b %d, %Y')} - {last_day.strftime('%b %d, %Y')}"
+    if export_filter and export_filter.employee_id is not None:
+        employee = db.session.get(Employee, export_filter.employee_id)
+        return f"{employee.name}, {period}"
+    if export_filter and export_filter.department_id is not None:
+        department = db.session.get(Department, export_filter.department_id)
+        return f"{department.name}, {period}"
+    return period
+
+def export_file_stem(prefix, first_day, last_day, export_filter=None):
+    """e.g. attendance_overview_202609, attendance_grid_20260901_20261015_employee5"""
+    if is_calendar_month(first_day, last_day):
+        stem = f"{prefix}_{first_day.strftime('%Y%m')}"
+    else:
+        stem = f"{prefix}_{first_day.strftime('%Y%m%d')}_{last_day.strftime('%Y%m%d')}"
+    key = export_filter_key(export_filter)
+    if key:
+        stem += '_' + key.replace('=', '').replace('&', '_')
+    return stem
+
+def parse_period_args(max_days, force_full_month=False):
+    """Return (first_day, last_day) from start_date/end_date, month or date query arguments
+    
+    start_date/end_date select a custom range of at most max_days days; otherwise month
+    (YYYY-MM or YYYY-MM-DD) or date picks a month as monthly_export_range does. Raises
+    ValueError with a client-facing message on bad input.
+    """
+    start_str = request.args.get('start_date')
+    end_str = request.args.get('end_date')
+    if start_str or end_str:
+        if not (start_str and end_str):
+            raise ValueError('start_date and end_date must be given together')
+        try:
+            first_day = datetime.strptime(start_str, '%Y-%m-%d').date()
+            last_day = datetime.strptime(end_str, '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('Invalid start_date/end_date format. Use YYYY-MM-DD')
+        if last_day < first_day:
+            raise ValueError('end_date must not be before start_date')
+        if (last_day - first_day).days + 1 > max_days:
+            raise ValueError(f'Date range cannot exceed {max_days} days')
+    else:
+        month_str = request.args.get('month')
+        try:
+            if month_str:
+                date_obj = datetime.strptime(month_str, '%Y-%m' if len(month_str) == 7 else '%Y-%m-%d').date()
+            else:
+                date_obj = datetime.strptime(request.args.get('date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+        except ValueError:
+            raise ValueError('Invalid date format. Use YYYY-MM-DD (month also accepts YYYY-MM)')
+        first_day, last_day = monthly_export_range(date_obj, force_full_month)
+    return first_day, last_day
+
+def parse_export_request(force_full_month=False):
+    """Return (first_day, last_day, ExportFilter) from an export request's query string
+    
+    The period is read by parse_period_args (custom ranges up to EXPORT_MAX_RANGE_DAYS).
+    Raises ValueError for malformed arguments and LookupError for an unknown employee
+    or department.
+    """
+    first_day, last_day = parse_period_args(app.config['EXPORT_MAX_RANGE_DAYS'], force_full_month)
+    
+    filter_ids = {}
+    for name in ExportFilter._fields:
+        value = request.args.get(name)
+        if value:
+            try:
+                filter_ids[name] = int(value)
+            except ValueError:
+                raise ValueError(f'Invalid {name}')
+    export_filter = ExportFilter(**filter_ids)
+    if export_filter.employee_id is not None and db.session.get(Employee, export_filter.employee_id) is None:
+        raise LookupError('Employee not found')
+    if export_filter.department_id is not None and db.session.get(Department, export_filter.department_id) is None:
+        raise LookupError('Department not found')
+    return first_day, last_day, export_filter
+
+# Excel export helpers (openpyxl rendering lives in excel_report, imported on first export)
+EXCEL_STATS_HEADERS = ['Present', 'Half Day', 'Absent', 'Leave', 'Overtime', 'Total Working Days']
+
+def excel_holiday_label(holiday_name):
+    """Holiday cell text, kept concise for Excel cells"""
+    if len(holiday_name) > 15:
+        return f"Holiday: {holiday_name[:12]}..."
+    return f"Holiday: {holiday_name}"
+
+def iter_export_employees(export_filter=None):
+    """Yield (id, name, email, department name) of the exported employees, ordered by id, from a server-side cursor"""
+    stmt = db.select(
+        Employee.id, Employee.name, Employee.email, Department.name
+    ).outerjoin(
+        Department, Employee.department_id == Department.id
+    ).where(
+        *export_employee_criteria(export_filter)
+    ).order_by(
+        Employee.id
+    ).execution_options(yield_per=app.config['EXPORT_STREAM_BATCH_SIZE'])
+    
+    result = db.session.execute(stmt)
+    try:
+        yield from result
+    finally:
+        result.close()
+
+def write_streaming_attendance_workbook(target, first_day, last_day, export_filter=None):
+    """Write the monthly attendance workbook to target using a write-only worksheet.
+    
+    Rows are appended as employees are read from the database and column widths are
+    derived from known field lengths up front. Statuses and counts come from the
+    month's status-code matrix (one byte per employee-day), so memory stays small
+    regardless of how many employees the month covers.
+    """
+    import excel_report
+    
+    holidays = Holiday.query.filter(
+        Holiday.date >= first_day,
+        Holiday.date <= last_day
+    ).all()
+    holiday_labels = {holiday.date: excel_holiday_label(holiday.name) for holiday in holidays}
+    
+    employee_ids = db.session.execute(
+        db.select(Employee.id).where(*export_employee_criteria(export_filter)).order_by(Employee.id)
+    ).scalars().all()
+    month_stats = load_month_stats(first_day, last_day, employee_ids, list(holiday_labels), export_filter)
+    status_counts = month_stats.status_counts()
+    status_columns = [ATTENDANCE_STATUS_CODES.index(status) for status in ATTENDANCE_STATUSES]
+    
+    all_dates = []
+    current_date = first_day
+    while current_date <= last_day:
+        all_dates.append(current_date)
+        current_date += timedelta(days=1)
+    
+    headers = ['Employee ID', 'Employee Name', 'Email', 'Department']
+    headers.extend(f"{d.day} {d.strftime('%a')}" for d in all_dates)
+    headers.extend(EXCEL_STATS_HEADERS)
+    
+    # Column widths must be known before the first row is written in write-only mode
+    max_employee_id = db.session.query(db.func.max(Employee.id)).scalar() or 0
+    widths = [
+        excel_report.column_width(max(len('Employee ID'), len(str(max_employee_id)))),
+        excel_report.column_width(Employee.__table__.c.name.type.length),
+        excel_report.column_width(Employee.__table__.c.email.type.length),
+        excel_report.column_width(Department.__table__.c.name.type.length),
+    ]
+    longest_status = max(len(status.replace('_', ' ')) for status in excel_report.STATUS_COLORS)
+    for header, d in zip(headers[4:], all_dates):
+        widths.append(excel_report.column_width(max(len(header), longest_status, len(holiday_labels.get(d, '')))))
+    widths.extend(excel_report.column_width(len(header)) for header in EXCEL_STATS_HEADERS)
+    
+    # Day columns that never depend on attendance can be shared by every row
+    day_styles = []
+    for d in all_dates:
+        if d in holiday_labels:
+            day_styles.append('holiday')
+        elif d.weekday() >= 5:
+            day_styles.append('weekend')
+        else:
+            day_styles.append('cell')
+    
+    def rows():
+        for emp_id, emp_name, emp_email, dept_name in iter_export_employees(export_filter):
+            stats_row = month_stats.row(emp_id)
+            if stats_row is None:
+                # Activated after the matrix was loaded: nothing marked for the period yet
+                statuses = ['not_marked'] * len(all_dates)
+                counts = [0] * len(ATTENDANCE_STATUSES)
+            else:
+                statuses = month_stats.status_names(stats_row)
+                counts = status_counts[stats_row, status_columns].tolist()
+            row = [
+                str(emp_id),
+                str(emp_name).strip() if emp_name else 'N/A',
+                str(emp_email).strip() if emp_email else 'N/A',
+                str(dept_name).strip() if dept_name else 'N/A'
+            ]
+            
+            for d, day_style, status in zip(all_dates, day_styles, statuses):
+                if d in holiday_labels:
+                    row.append((holiday_labels[d], day_style))
+                elif status != 'not_marked':
+                    style_key = status if status in excel_report.STATUS_COLORS else 'cell'
+                    row.append((status.replace('_', ' ').title(), style_key))
+                else:
+                    row.append(('', day_style))
+            
+            row.extend(counts)
+            row.append(sum(counts))
+            yield row
+    
+    subject = export_subject(first_day, last_day, export_filter)
+    excel_report.write_streaming_workbook(
+        target,
+        f"Attendance Overview - {subject}",
+        f"Attendance {subject}",
+        headers, widths, rows()
+    )
+
+def stream_file_chunks(file_obj, chunk_size=None):
+    """Yield a file in fixed-size chunks and close it once fully sent"""
+    chunk_size = chunk_size or app.config['EXPORT_STREAM_CHUNK_SIZE']
+    try:
+        file_obj.seek(0)
+        while True:
+            chunk = file_obj.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        file_obj.close()
+
+def monthly_export_range(date_obj, force_full_month=False):
+    """Return (first_day, last_day) of a monthly export
+    
+    The current month stops at today unless force_full_month is set; past and
+    future months always cover the whole month.
+    """
+    first_day = date_obj.replace(day=1)
+    today = datetime.now().date()
+    
+    # Calculate the last day of the month
+    if first_day.month == 12:
+        month_last_day = first_day.replace(year=first_day.year + 1, month=1, day=1) - timedelta(days=1)
+    else:
+        month_last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
+    
+    if not force_full_month and first_day.year == today.year and first_day.month == today.month:
+        return first_day, today  # Only show dates up to today for current month
+    return first_day, month_last_day
+
+def stream_attendance_excel(first_day, last_day, data_version=None, export_filter=None):
+    """Build the monthly Excel export on disk and send it as a chunked response"""
+    spool = tempfile.TemporaryFile()
+    try:
+        write_streaming_attendance_workbook(spool, first_day, last_day, export_filter)
+    except Exception:
+        spool.close()
+        raise
+    
+    subject = export_subject(first_day, last_day, export_filter)
+    filename = f"{export_file_stem('attendance_overview', first_day, last_day, export_filter)}.xlsx"
+    file_id = save_file_to_db(
+        file_data=spool,
+        filename=filename,
+        file_type='excel',
+        description=f'Attendance overview for {subject}',
+        related_table='attendance',
+        related_id=None
+    )
+    if data_version is not None:
+        store_cached_report('excel_stream', first_day, last_day, data_version, file_id, export_filter_key(export_filter))
+    log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None,
+                   None, {'filename': filename, 'file_id': file_id, 'mode': 'stream'},
+                   f'Excel report streamed for {subject}')
+    
+    return Response(
+        stream_file_chunks(spool),
+        mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+        direct_passthrough=True
+    )
+
+def iter_attendance_grid(first_day, last_day, export_filter=None):
+    """Yield (employee id, name, email, department name, statuses) per exported employee, ordered by id
+    
+    statuses has one entry per day of the period: the stored status, or None when nothing
+    is marked. Employees and their marks come from one server-side cursor, so only one
+    employee's rows are held in memory at a time.
+    """
+    stmt = db.select(
+        Employee.id, Employee.name, Employee.email, Department.name, Attendance.date, Attendance.status
+    ).outerjoin(
+        Department, Employee.department_id == Department.id
+    ).outerjoin(
+        Attendance, and_(
+            Attendance.employee_id == Employee.id,
+            Attendance.date >= first_day,
+            Attendance.date <= last_day
+        )
+    ).where(
+        *export_employee_criteria(export_filter)
+    ).order_by(
+        Employee.id
+    ).execution_options(yield_per=app.config['EXPORT_STREAM_BATCH_SIZE'])
+    
+    day_count = (last_day - first_day).days + 1
+    result = db.session.execute(stmt)
+    try:
+        for emp_id, rows in groupby(result, key=lambda row: row[0]):
+            statuses = [None] * day_count
+            for _, emp_name, emp_email, dept_name, day, status in rows:
+                if day is not None:
+                    statuses[(day - first_day).days] = status
+            yield emp_id, emp_name, emp_email, dept_name, statuses
+    finally:
+        result.close()
+
+def attendance_grid_header(first_day, last_day):
+    return ['Employee ID', 'Employee Name', 'Email', 'Department'] + [
+        day.isoformat() for day in period_days(first_day, last_day)
+    ]
+
+def iter_attendance_csv(first_day, last_day, chunk_size=None, export_filter=None):
+    """Yield the raw attendance grid as encoded CSV chunks of roughly chunk_size bytes"""
+    chunk_size = chunk_size or app.config['EXPORT_STREAM_CHUNK_SIZE']
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(attendance_grid_header(first_day, last_day))
+    for emp_id, emp_name, emp_email, dept_name, statuses in iter_attendance_grid(first_day, last_day, export_filter):
+        writer.writerow([emp_id, emp_name or '', emp_email or '', dept_name or ''] +
+                        [status or '' for status in statuses])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue().encode('utf-8')
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+def write_attendance_csv(target, first_day, last_day, export_filter=None):
+    """Write the raw attendance grid as CSV to a binary file object"""
+    for chunk in iter_attendance_csv(first_day, last_day, export_filter=export_filter):
+        target.write(chunk)
+
+PARQUET_UNAVAILABLE_MESSAGE = 'Parquet export requires the pyarrow package to be installed'
+
+def write_attendance_parquet(target, first_day, last_day, export_filter=None):
+    """Write the raw attendance grid as Parquet, one row group per EXPORT_PARQUET_ROW_GROUP_SIZE employees
+    
+    Each day column is dictionary encoded: int8 indices into the status names, null when
+    nothing is marked (unrecognised statuses are stored as 'other').
+    """
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError(PARQUET_UNAVAILABLE_MESSAGE)
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    
+    header = attendance_grid_header(first_day, last_day)
+    status_names = ATTENDANCE_STATUS_CODES[1:]
+    status_indices = {status: index for index, status in enumerate(status_names)}
+    other_index = status_indices['other']
+    status_dictionary = pa.array(status_names, type=pa.string())
+    status_type = pa.dictionary(pa.int8(), pa.string())
+    schema = pa.schema(
+        [('employee_id', pa.int64()), ('employee_name', pa.string()), ('email', pa.string()),
+         ('department', pa.dictionary(pa.int32(), pa.string()))] +
+        [(day, status_type) for day in header[4:]]
+    )
+    
+    def batch_to_record_batch(batch):
+        columns = [
+            pa.array([row[0] for row in batch], type=pa.int64()),
+            pa.array([row[1] for row in batch], type=pa.string()),
+            pa.array([row[2] for row in batch], type=pa.string()),
+            pa.array([row[3] for row in batch], type=pa.string()).dictionary_encode(),
+        ]
+        for day_index in range(len(header) - 4):
+            indices = [
+                None if row[4][day_index] is None else status_indices.get(row[4][day_index], other_index)
+                for row in batch
+            ]
+            columns.append(pa.DictionaryArray.from_arrays(pa.array(indices, type=pa.int8()), status_dictionary))
+        return pa.RecordBatch.from_arrays(columns, schema=schema)
+    
+    row_group_size = app.config['EXPORT_PARQUET_ROW_GROUP_SIZE']
+    with pq.ParquetWriter(target, schema) as writer:
+        batch = []
+        for grid_row in iter_attendance_grid(first_day, last_day, export_filter):
+            batch.append(grid_row)
+            if len(batch) >= row_group_size:
+                writer.write_batch(batch_to_record_batch(batch))
+                batch = []
+        if batch:
+            writer.write_batch(batch_to_record_batch(batch))
+
+def stream_attendance_csv(first_day, last_day, export_filter=None):
+    """Stream the raw attendance grid as CSV straight from the database cursor (nothing is buffered or stored)"""
+    filename = f"{export_file_stem('attendance_grid', first_day, last_day, export_filter)}.csv"
+    log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None,
+                   None, {'filename': filename, 'mode': 'csv'},
+                   f'CSV grid streamed for {export_subject(first_day, last_day, export_filter)}')
+    return Response(
+        stream_with_context(iter_attendance_csv(first_day, last_day, export_filter=export_filter)),
+        mimetype='text/csv',
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
 
-@app.route('/admin/attendance/validate', methods=['GET'])
-@jwt_required()
-def validate_attendance_completion():
-    """Validate if all attendance is marked for the specified month up to today"""
+def send_attendance_parquet(first_day, last_day, data_version, export_filter=None):
+    """Write the Parquet grid to a spool file, keep it in the report cache and send it in chunks"""
+    spool = tempfile.TemporaryFile()
     try:
-        date_str = request.args.get('date', datetime.now().date().isoformat())
-        
-        # Convert string date to date object
-        if isinstance(date_str, str):
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        else:
-            date_obj = date_str
-            
-        # Get first day of the month
-        first_day = date_obj.replace(day=1)
-        today = datetime.now().date()
-        
-        # Only validate up to today if we're in the current month
-        if first_day.year == today.year and first_day.month == today.month:
-            last_day = today
-        else:
-            # For past/future months, get the last day of that month
-            if first_day.month == 12:
-                last_day = first_day.replace(year=first_day.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
-        
-        # Get all active employees
-        employees = Employee.query.filter_by(is_active=True).all()
-        
-        # Get holidays for the period
-        holidays = Holiday.query.filter(
-            Holiday.date >= first_day,
-            Holiday.date <= last_day
-        ).all()
-        holiday_dates = {holiday.date for holiday in holidays}
-        
-        # Get attendance records for the period
-        attendance_records = Attendance.query.filter(
-            Attendance.date >= first_day,
-            Attendance.date <= last_day
-        ).all()
-        
-        # Create attendance lookup
-        attendance_dict = {}
-        for record in attendance_records:
-            key = f"{record.employee_id}_{record.date.isoformat()}"
-            attendance_dict[key] = record.status
-        
-        # Count working days (excluding weekends and holidays)
-        working_days = []
-        current_date = first_day
-        while current_date <= last_day:
-            if current_date.weekday() < 5 and current_date not in holiday_dates:  # Exclude weekends and holidays
-                working_days.append(current_date)
-            current_date += timedelta(days=1)
-        
-        # Check for missing attendance
-        missing_attendance = []
-        total_expected_records = len(employees) * len(working_days)
-        actual_records = 0
-        
-        for employee in employees:
-            for work_day in working_days:
-                key = f"{employee.id}_{work_day.isoformat()}"
-                if key in attendance_dict:
-                    actual_records += 1
-                else:
-                    missing_attendance.append({
-                        'employee_id': employee.id,
-                        'employee_name': employee.name,
-                        'date': work_day.isoformat(),
-                        'date_formatted': work_day.strftime('%B %d, %Y')
-                    })
-        
-        completion_percentage = (actual_records / total_expected_records * 100) if total_expected_records > 0 else 100
-        
-        return jsonify({
-            'is_complete': len(missing_attendance) == 0,
-            'total_expected': total_expected_records,
-            'total_marked': actual_records,
-            'missing_count': len(missing_attendance),
-            'completion_percentage': round(completion_percentage, 1),
-            'missing_attendance': missing_attendance[:10],  # Limit to first 10 for display
-            'period': {
-                'start_date': first_day.isoformat(),
-                'end_date': last_day.isoformat(),
-                'month_name': first_day.strftime('%B %Y')
-            },
-            'working_days_count': len(working_days),
-            'employees_count': len(employees)
-        })
-        
-    except Exception as e:
-        print(f"Attendance validation error: {e}")
-        return jsonify({'error': f'Failed to validate attendance: {str(e)}'}), 500
+        write_attendance_parquet(spool, first_day, last_day, export_filter)
+    except Exception:
+        spool.close()
+        raise
+    
+    subject = export_subject(first_day, last_day, export_filter)
+    filename = f"{export_file_stem('attendance_grid', first_day, last_day, export_filter)}.parquet"
+    file_id = save_file_to_db(
+        file_data=spool,
+        filename=filename,
+        file_type='parquet',
+        description=f'Attendance grid for {subject}',
+        related_table='attendance',
+        related_id=None
+    )
+    store_cached_report('parquet', first_day, last_day, data_version, file_id, export_filter_key(export_filter))
+    log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None,
+                   None, {'filename': filename, 'file_id': file_id, 'mode': 'parquet'},
+                   f'Parquet grid exported for {subject}')
+    
+    return Response(
+        stream_file_chunks(spool),
+        mimetype='application/vnd.apache.parquet',
+        headers={'Content-Disposition': f'attachment; filename={filename}'},
+        direct_passthrough=True
+    )
+
+EXPORT_FORMATS = ('excel', 'csv', 'parquet')
 
 @app.route('/admin/attendance/export', methods=['GET'])
 @jwt_required()
 def export_attendance_monthly_report():
-    """Export full month attendance report to Excel file"""
+    """Export full month attendance report to Excel file
+    
+    Pass stream=true to use the constant-memory streaming writer for large months.
+    format=csv streams the raw status grid (one column per day) row by row;
+    format=parquet returns the same grid as a Parquet file.
+    employee_id or department_id narrow the report, and start_date/end_date replace
+    the month (date or month=YYYY-MM) with a custom range.
+    """
     try:
-        date_str = request.args.get('date', datetime.now().date().isoformat())
-        print(f"Monthly export request for date: {date_str}")
-        
-        # Convert string date to date object and get month start/end
-        if isinstance(date_str, str):
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        else:
-            date_obj = date_str
-            
-        # Get first day of the month and last day
-        first_day = date_obj.replace(day=1)
-        today = datetime.now().date()
-        
         # Check if user wants to force full month export
         force_full_month = request.args.get('force_full_month', 'false').lower() == 'true'
-        
-        # Calculate the last day of the month
-        if first_day.month == 12:
-            month_last_day = first_day.replace(year=first_day.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            month_last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
-        
-        # Determine export range
-        if force_full_month:
-            last_day = month_last_day  # Force full month when requested
-            print(f"Force full month export: {first_day} to {last_day}")
-        elif first_day.year == today.year and first_day.month == today.month:
-            last_day = today  # Only show dates up to today for current month
-            print(f"Current month partial export: {first_day} to {last_day}")
-        else:
-            last_day = month_last_day  # Show full month for past/future months
-            print(f"Full month export: {first_day} to {last_day}")
-        
-        # Get all employees
-        employees = Employee.query.filter_by(is_active=True).all()
-        print(f"Found {len(employees)} active employees")
-        
-        # Get all attendance records for the month
-        attendance_records = Attendance.query.filter(
-            Attendance.date >= first_day,
-            Attendance.date <= last_day
-        ).all()
-        print(f"Found {len(attendance_records)} attendance records for the month")
+        try:
+            first_day, last_day, export_filter = parse_export_request(force_full_month)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        except LookupError as e:
+            return jsonify({'message': str(e)}), 404
+        report_filter = export_filter_key(export_filter)
+        subject = export_subject(first_day, last_day, export_filter)
+        print(f"Export range: {first_day} to {last_day} {report_filter}")
+        
+        export_format = request.args.get('format', 'excel')
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'message': f'Invalid format. Must be one of: {", ".join(EXPORT_FORMATS)}'}), 400
+        if export_format == 'csv':
+            return stream_attendance_csv(first_day, last_day, export_filter)
+        if export_format == 'parquet':
+            if not PARQUET_AVAILABLE:
+                return jsonify({'message': PARQUET_UNAVAILABLE_MESSAGE}), 501
+            data_version = report_data_version(first_day, last_day)
+            cached_file = get_cached_report('parquet', first_day, last_day, data_version, report_filter)
+            if cached_file:
+                return send_cached_report(cached_file, subject)
+            return send_attendance_parquet(first_day, last_day, data_version, export_filter)
+        
+        # Identical report already generated for this data version: serve the stored file
+        stream = request.args.get('stream', 'false').lower() == 'true'
+        data_version = report_data_version(first_day, last_day)
+        cached_file = get_cached_report('excel_stream' if stream else 'excel', first_day, last_day,
+                                        data_version, report_filter)
+        if cached_file:
+            return send_cached_report(cached_file, subject)
+        
+        # Large months: write-only workbook streamed from a server-side cursor
+        if stream:
+            return stream_attendance_excel(first_day, last_day, data_version, export_filter)
+        
+        # Get the exported employees
+        employees = Employee.query.options(joinedload(Employee.department)).filter(
+            *export_employee_criteria(export_filter)
+        ).order_by(Employee.id).all()
+        print(f"Found {len(employees)} employees to export")
         
         # Get holidays for the month
         try:
@@ -1004,11 +3062,11 @@ def export_attendance_monthly_report():
             holiday_dict[holiday.date.isoformat()] = holiday.name
             print(f"Holiday mapped: {holiday.date.isoformat()} -> {holiday.name}")
         
-        # Create attendance lookup dictionary
-        attendance_dict = {}
-        for record in attendance_records:
-            key = f"{record.employee_id}_{record.date.isoformat()}"
-            attendance_dict[key] = record.status
+        # Status matrix and per-employee working-day counts from the shared stats engine
+        month_stats = load_month_stats(first_day, last_day, [employee.id for employee in employees],
+                                       [holiday.date for holiday in holidays], export_filter)
+        status_counts = {status: month_stats.counts_for(status).tolist() for status in ATTENDANCE_STATUSES}
+        total_counts = month_stats.total_for(ATTENDANCE_STATUSES).tolist()
         
         # Generate all dates in the month
         current_date = first_day
@@ -1017,57 +3075,15 @@ def export_attendance_monthly_report():
             all_dates.append(current_date)
             current_date += timedelta(days=1)
         
-        # Create Excel workbook with compatibility settings
-        wb = Workbook()
-        ws = wb.active
-        # Ensure worksheet title is Excel-safe
-        safe_title = f"Attendance {first_day.strftime('%B %Y')}"
-        # Remove any characters that might cause issues
-        safe_title = ''.join(c for c in safe_title if c.isalnum() or c in ' -_')
-        ws.title = safe_title[:31]  # Excel sheet names max 31 chars
-        
-        # Set workbook properties for compatibility
-        wb.properties.title = f"Attendance Overview - {first_day.strftime('%B %Y')}"
-        wb.properties.subject = "Employee Attendance Report"
-        wb.properties.creator = "Attendance Management System"
-        
-        # Define styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-        center_alignment = Alignment(horizontal="center", vertical="center")
-        weekend_fill = PatternFill(start_color="F0F0F0", end_color="F0F0F0", fill_type="solid")
-        
-        # Status color mapping
-        status_fills = {
-            'present': PatternFill(start_color="90EE90", end_color="90EE90", fill_type="solid"),
-            'half_day': PatternFill(start_color="FFFF99", end_color="FFFF99", fill_type="solid"),
-            'absent': PatternFill(start_color="FFB6C1", end_color="FFB6C1", fill_type="solid"),
-            'leave': PatternFill(start_color="ADD8E6", end_color="ADD8E6", fill_type="solid"),
-            'overtime': PatternFill(start_color="DDA0DD", end_color="DDA0DD", fill_type="solid")
-        }
-        
-        # Holiday fill pattern (red background)
-        holiday_fill = PatternFill(start_color="FFE6E6", end_color="FFE6E6", fill_type="solid")
-        
-        # Create headers
+        # Header row, then one row per employee; day cells are (value, style key) for excel_report
         headers = ['Employee ID', 'Employee Name', 'Email', 'Department']
         for date in all_dates:
             # Remove newlines to avoid Excel warnings
             headers.append(f"{date.day} {date.strftime('%a')}")
-        headers.extend(['Present', 'Half Day', 'Absent', 'Leave', 'Overtime', 'Total Working Days'])
-        
-        # Set headers with improved formatting
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=str(header))  # Ensure string value
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = center_alignment
+        headers.extend(EXCEL_STATS_HEADERS)
         
-        # Set header row height
-        ws.row_dimensions[1].height = 25
-        
-        # Add employee data
-        for row, employee in enumerate(employees, 2):
+        rows = []
+        for stats_row, employee in enumerate(employees):
             # Employee info - ensure all values are clean strings
             employee_id = str(employee.id) if employee.id else 'N/A'
             employee_name = str(employee.name).strip() if employee.name else 'N/A'
@@ -1082,77 +3098,42 @@ def export_attendance_monthly_report():
             else:
                 dept_name = 'N/A'
             
-            ws.cell(row=row, column=1, value=employee_id)
-            ws.cell(row=row, column=2, value=employee_name)
-            ws.cell(row=row, column=3, value=employee_email)
-            ws.cell(row=row, column=4, value=dept_name)
+            row = [employee_id, employee_name, employee_email, dept_name]
             
             # Attendance data for each day
-            stats = {'present': 0, 'half_day': 0, 'absent': 0, 'leave': 0, 'overtime': 0}
+            statuses = month_stats.status_names(stats_row)
             
-            for col_idx, date in enumerate(all_dates, 5):
-                key = f"{employee.id}_{date.isoformat()}"
-                status = attendance_dict.get(key, '')
+            for date, status in zip(all_dates, statuses):
+                if status == 'not_marked':
+                    status = ''
                 date_str = date.isoformat()
-                is_holiday = date_str in holiday_dict
-                holiday_name = holiday_dict.get(date_str, '')
                 
                 # Determine display value and fill
-                if is_holiday:
+                if date_str in holiday_dict:
                     # Show holiday name (keep it concise for Excel cells)
-                    if len(holiday_name) > 15:
-                        display_value = f"Holiday: {holiday_name[:12]}..."
-                    else:
-                        display_value = f"Holiday: {holiday_name}"
-                    cell_fill = holiday_fill
+                    row.append((excel_holiday_label(holiday_dict[date_str]), 'holiday'))
                 elif status:
-                    display_value = status.replace('_', ' ').title()
-                    cell_fill = status_fills.get(status, None)
-                    if status in stats:
-                        stats[status] += 1
+                    row.append((status.replace('_', ' ').title(), status))
                 elif date.weekday() >= 5:  # Weekend
-                    display_value = ''
-                    cell_fill = weekend_fill
+                    row.append(('', 'weekend'))
                 else:
-                    display_value = ''
-                    cell_fill = None
-                
-                cell = ws.cell(row=row, column=col_idx, value=display_value)
-                cell.alignment = center_alignment
-                
-                # Apply the determined fill
-                if cell_fill:
-                    cell.fill = cell_fill
+                    row.append(('', 'cell'))
             
             # Add summary statistics with proper numeric formatting
-            stats_start_col = len(all_dates) + 5
-            ws.cell(row=row, column=stats_start_col, value=int(stats['present']))
-            ws.cell(row=row, column=stats_start_col + 1, value=int(stats['half_day']))
-            ws.cell(row=row, column=stats_start_col + 2, value=int(stats['absent']))
-            ws.cell(row=row, column=stats_start_col + 3, value=int(stats['leave']))
-            ws.cell(row=row, column=stats_start_col + 4, value=int(stats['overtime']))
-            ws.cell(row=row, column=stats_start_col + 5, value=int(sum(stats.values())))
-        
-        # Auto-adjust column widths safely
-        for column in ws.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if cell.value is not None:
-                        cell_length = len(str(cell.value))
-                        if cell_length > max_length:
-                            max_length = cell_length
-                except Exception:
-                    continue  # Skip problematic cells
-            # Ensure reasonable width bounds
-            adjusted_width = min(max(max_length + 2, 10), 30)
-            ws.column_dimensions[column_letter].width = adjusted_width
+            row.extend(status_counts[status][stats_row] for status in ATTENDANCE_STATUSES)
+            row.append(total_counts[stats_row])
+            rows.append(row)
         
         # Save to BytesIO buffer with proper handling
+        import excel_report
         output = io.BytesIO()
         try:
-            wb.save(output)
+            excel_report.write_buffered_workbook(
+                output,
+                f"Attendance Overview - {subject}",
+                f"Attendance {subject}",
+                headers, rows
+            )
             output.seek(0)
             file_data = output.getvalue()
             output.seek(0)  # Reset for send_file
@@ -1161,7 +3142,7 @@ def export_attendance_monthly_report():
             raise
         
         # Create filename
-        filename = f"attendance_overview_{first_day.strftime('%Y%m')}.xlsx"
+        filename = f"{export_file_stem('attendance_overview', first_day, last_day, export_filter)}.xlsx"
         print(f"Excel file created: {filename}")
         
         # Save file to database
@@ -1170,15 +3151,16 @@ def export_attendance_monthly_report():
                 file_data=file_data,
                 filename=filename,
                 file_type='excel',
-                description=f'Monthly attendance overview for {first_day.strftime("%B %Y")}',
+                description=f'Attendance overview for {subject}',
                 related_table='attendance',
                 related_id=None
             )
+            store_cached_report('excel', first_day, last_day, data_version, file_id, report_filter)
             
             # Log the export action
             log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None, 
                            None, {'filename': filename, 'file_id': file_id}, 
-                           f'Monthly Excel report exported for {first_day.strftime("%B %Y")}')
+                           f'Excel report exported for {subject}')
             
             print(f"File saved to database with ID: {file_id}")
         except Exception as e:
@@ -1194,153 +3176,115 @@ def export_attendance_monthly_report():
         print(f"Excel export error: {e}")
         return jsonify({'error': f'Failed to export Excel: {str(e)}'}), 500
 
+def write_attendance_pdf(output, first_day, last_day, by_department=False, parallel=False, export_filter=None):
+    """Render the monthly attendance PDF for first_day..last_day into a binary file object
+    
+    by_department splits the table into one section per department; parallel renders
+    those sections in worker processes. Returns the renderer's {'pages', 'seconds', 'parallel'}.
+    """
+    from pdf_report import render_report as render_pdf_report
+    
+    # Get the exported employees
+    employees = Employee.query.options(joinedload(Employee.department)).filter(
+        *export_employee_criteria(export_filter)
+    ).order_by(Employee.id).all()
+    
+    holiday_dates = db.session.execute(
+        db.select(Holiday.date).where(Holiday.date >= first_day, Holiday.date <= last_day)
+    ).scalars().all()
+    working_days_count = int(day_masks(period_days(first_day, last_day), holiday_dates)[2].sum())
+    
+    # Working-day status counts: whole months come from the monthly summary without reading
+    # day-level rows, other ranges from the shared stats engine
+    if is_whole_months(first_day, last_day):
+        summary_counts = load_summary_counts(first_day, last_day, holiday_dates, export_filter)
+        employee_counts = [summary_counts.get(employee.id, [0] * len(ATTENDANCE_STATUSES)) for employee in employees]
+    else:
+        month_stats = load_month_stats(first_day, last_day, [employee.id for employee in employees],
+                                       holiday_dates, export_filter)
+        status_columns = [ATTENDANCE_STATUS_CODES.index(status) for status in ATTENDANCE_STATUSES]
+        employee_counts = month_stats.status_counts()[:, status_columns].tolist()
+    present_index = ATTENDANCE_STATUSES.index('present')
+    
+    rows_by_section = {}
+    for employee, counts in zip(employees, employee_counts):
+        section = (employee.department.name if employee.department else 'No Department') if by_department else None
+        present_percentage = counts[present_index] * 100.0 / working_days_count if working_days_count else 0.0
+        rows_by_section.setdefault(section, []).append(
+            [employee.name]
+            + [str(count) for count in counts]
+            + [str(sum(counts)), f"{present_percentage:.1f}%"]
+        )
+    if by_department:
+        sections = [(f"{name} ({len(rows)} employees)", rows) for name, rows in sorted(
+            rows_by_section.items(), key=lambda item: (item[0] == 'No Department', item[0]))]
+    else:
+        sections = [(None, rows_by_section.get(None, []))]
+    
+    summary_lines = [
+        f"Total Employees: {len(employees)}",
+        f"Total Working Days: {working_days_count}",  # Excludes weekends and holidays
+        f"Report Period: {first_day.strftime('%B %d')} - {last_day.strftime('%B %d, %Y')}"
+    ]
+    # Title and summary lines are Paragraph markup: names are escaped
+    if export_filter and export_filter.department_id is not None:
+        summary_lines.insert(0, f"Department: {escape(db.session.get(Department, export_filter.department_id).name)}")
+    if export_filter and export_filter.employee_id is not None:
+        employee = db.session.get(Employee, export_filter.employee_id)
+        summary_lines.insert(0, f"Employee: {escape(employee.name)} ({escape(employee.email)})")
+    
+    return render_pdf_report(
+        output,
+        sections,
+        title=f"{'Monthly ' if is_calendar_month(first_day, last_day) else ''}Attendance Overview - "
+              f"{escape(export_subject(first_day, last_day, export_filter))}",
+        summary_lines=summary_lines,
+        chunk_size=app.config['PDF_TABLE_CHUNK_SIZE'],
+        parallel_workers=app.config['PDF_SECTION_WORKERS'] if parallel else 0
+    )
+
 @app.route('/admin/attendance/export-pdf', methods=['GET'])
 @jwt_required()
 def export_attendance_monthly_report_pdf():
-    """Export monthly attendance report to PDF file"""
+    """Export monthly attendance report to PDF file
+    
+    sections=department groups the table by department; parallel=true additionally
+    renders the department sections in worker processes. Page count and render time
+    are reported in the X-PDF-* response headers. employee_id, department_id and
+    start_date/end_date filter the report as for /admin/attendance/export.
+    """
     try:
-        date_str = request.args.get('date', datetime.now().date().isoformat())
-        print(f"Monthly PDF Export request for date: {date_str}")
-        
-        # Convert string date to date object and get month start/end
-        if isinstance(date_str, str):
-            date_obj = datetime.strptime(date_str, '%Y-%m-%d').date()
-        else:
-            date_obj = date_str
-            
-        # Get first and last day of the month
-        first_day = date_obj.replace(day=1)
-        if first_day.month == 12:
-            last_day = first_day.replace(year=first_day.year + 1, month=1, day=1) - timedelta(days=1)
-        else:
-            last_day = first_day.replace(month=first_day.month + 1, day=1) - timedelta(days=1)
-        
-        # Get all active employees
-        employees = Employee.query.filter_by(is_active=True).all()
-        
-        # Get all attendance records for the month
-        attendance_records = Attendance.query.filter(
-            Attendance.date >= first_day,
-            Attendance.date <= last_day
-        ).all()
-        
-        # Create attendance lookup dictionary
-        attendance_dict = {}
-        for record in attendance_records:
-            key = f"{record.employee_id}_{record.date.isoformat()}"
-            attendance_dict[key] = record.status
-        
-        # Generate all dates in the month
-        current_date = first_day
-        all_dates = []
-        while current_date <= last_day:
-            all_dates.append(current_date)
-            current_date += timedelta(days=1)
+        # Full calendar month unless a custom range is given
+        try:
+            first_day, last_day, export_filter = parse_export_request(force_full_month=True)
+        except ValueError as e:
+            return jsonify({'message': str(e)}), 400
+        except LookupError as e:
+            return jsonify({'message': str(e)}), 404
+        report_filter = export_filter_key(export_filter)
+        subject = export_subject(first_day, last_day, export_filter)
+        print(f"PDF export range: {first_day} to {last_day} {report_filter}")
+        
+        parallel = request.args.get('parallel', 'false').lower() == 'true'
+        by_department = parallel or request.args.get('sections') == 'department'
+        report_format = 'pdf_department' if by_department else 'pdf'
+        
+        data_version = report_data_version(first_day, last_day)
+        cached_file = get_cached_report(report_format, first_day, last_day, data_version, report_filter)
+        if cached_file:
+            return send_cached_report(cached_file, subject)
         
         # Create PDF in memory
         output = io.BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=A4)
-        
-        # Define styles
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            spaceAfter=20,
-            alignment=1  # Center alignment
-        )
-        
-        normal_style = ParagraphStyle(
-            'CustomNormal',
-            parent=styles['Normal'],
-            fontSize=8,
-            leading=10
-        )
-        
-        # Create content
-        story = []
-        
-        # Title
-        title = f"Monthly Attendance Overview - {first_day.strftime('%B %Y')}"
-        story.append(Paragraph(title, title_style))
-        story.append(Spacer(1, 20))
-        
-        # Summary statistics
-        total_employees = len(employees)
-        total_working_days = len([d for d in all_dates if d.weekday() < 5])  # Exclude weekends
-        
-        summary_text = f"<b>Report Summary:</b><br/>"
-        summary_text += f"Total Employees: {total_employees}<br/>"
-        summary_text += f"Total Working Days: {total_working_days}<br/>"
-        summary_text += f"Report Period: {first_day.strftime('%B %d')} - {last_day.strftime('%B %d, %Y')}<br/>"
-        
-        story.append(Paragraph(summary_text, normal_style))
-        story.append(Spacer(1, 20))
-        
-        # Create summary table for each employee
-        table_data = [['Employee', 'Present', 'Half Day', 'Absent', 'Leave', 'Overtime', 'Total Days', 'Attendance %']]
-        
-        for employee in employees:
-            stats = {'present': 0, 'half_day': 0, 'absent': 0, 'leave': 0, 'overtime': 0}
-            
-            for date in all_dates:
-                if date.weekday() < 5:  # Only count working days
-                    key = f"{employee.id}_{date.isoformat()}"
-                    status = attendance_dict.get(key, '')
-                    if status in stats:
-                        stats[status] += 1
-            
-            total_marked = sum(stats.values())
-            attendance_percentage = (stats['present'] / total_working_days * 100) if total_working_days > 0 else 0
-            
-            table_data.append([
-                employee.name,
-                str(stats['present']),
-                str(stats['half_day']),
-                str(stats['absent']),
-                str(stats['leave']),
-                str(stats['overtime']),
-                str(total_marked),
-                f"{attendance_percentage:.1f}%"
-            ])
-        
-        
-        # Create table
-        table = Table(table_data)
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
-        ]))
-        
-        story.append(table)
-        story.append(Spacer(1, 20))
-        
-        # Add legend
-        legend_text = "<b>Status Legend:</b><br/>"
-        legend_text += "Present: Full working day<br/>"
-        legend_text += "Half Day: Partial working day<br/>"
-        legend_text += "Absent: Did not attend<br/>"
-        legend_text += "Leave: On approved leave<br/>"
-        legend_text += "Overtime: Worked extra hours<br/>"
-        
-        story.append(Paragraph(legend_text, normal_style))
-        
-        # Build PDF
-        doc.build(story)
+        render = write_attendance_pdf(output, first_day, last_day, by_department, parallel, export_filter)
         output.seek(0)
+        budget = app.config['PDF_RENDER_BUDGET_SECONDS']
+        print(f"PDF rendered: {render['pages']} pages in {render['seconds']:.2f}s (parallel: {render['parallel']})")
+        if render['seconds'] > budget:
+            print(f"PDF render time {render['seconds']:.2f}s exceeded the {budget:.0f}s budget")
         
         # Create filename
-        filename = f"attendance_overview_{first_day.strftime('%Y%m')}.pdf"
+        filename = f"{export_file_stem('attendance_overview', first_day, last_day, export_filter)}.pdf"
         
         # Save file to database (optional)
         try:
@@ -1348,39 +3292,244 @@ def export_attendance_monthly_report_pdf():
                 file_data=output.getvalue(),
                 filename=filename,
                 file_type='pdf',
-                description=f'Monthly attendance overview PDF for {first_day.strftime("%B %Y")}',
+                description=f'Attendance overview PDF for {subject}',
                 related_table='attendance',
                 related_id=None
             )
+            store_cached_report(report_format, first_day, last_day, data_version, file_id, report_filter)
             
             # Log the export action
             log_audit_action(get_jwt_identity(), 'EXPORT', 'attendance', None, 
                            None, {'filename': filename, 'file_id': file_id}, 
-                           f'Monthly PDF report exported for {first_day.strftime("%B %Y")}')
+                           f'PDF report exported for {subject}')
         except Exception as e:
             print(f"Error saving PDF to database: {e}")
         
-        return send_file(
+        response = send_file(
             output,
             as_attachment=True,
             download_name=filename,
             mimetype='application/pdf'
         )
+        response.headers['X-PDF-Pages'] = str(render['pages'])
+        response.headers['X-PDF-Render-Seconds'] = f"{render['seconds']:.3f}"
+        response.headers['X-PDF-Render-Budget-Seconds'] = f"{budget:g}"
+        return response
     
     except Exception as e:
         print(f"PDF Export error: {str(e)}")
         return jsonify({'error': 'Failed to export PDF report'}), 500
 
+# Background export jobs
+EXPORT_JOB_FORMATS = {
+    # format: (file extension, writer(file_obj, first_day, last_day), description, report cache format)
+    'excel': ('xlsx', write_streaming_attendance_workbook, 'Monthly attendance overview', 'excel_stream'),
+    'pdf': ('pdf', write_attendance_pdf, 'Monthly attendance overview PDF', 'pdf'),
+    'csv': ('csv', write_attendance_csv, 'Monthly attendance grid CSV', 'csv'),
+    'parquet': ('parquet', write_attendance_parquet, 'Monthly attendance grid Parquet', 'parquet'),
+}
+EXPORT_JOB_ACTIVE_STATUSES = ('queued', 'running')
+export_job_lock = threading.Lock()
+
+def init_export_worker():
+    """Process pool initializer: job workers write audit rows synchronously"""
+    app.config['AUDIT_LOG_ASYNC'] = False
+
+def run_export_job(job_id):
+    """Render one export job inside a worker process and link the stored file to it"""
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        if job is None or job.status != 'queued':
+            return
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+        
+        try:
+            extension, writer, description, report_format = EXPORT_JOB_FORMATS[job.export_format]
+            filename = f"attendance_overview_{job.period_start.strftime('%Y%m')}.{extension}"
+            data_version = report_data_version(job.period_start)
+            cached_file = get_cached_report(report_format, job.period_start, job.period_end, data_version)
+            if cached_file:
+                file_id = cached_file.id
+            else:
+                with tempfile.TemporaryFile() as spool:
+                    writer(spool, job.period_start, job.period_end)
+                    file_id = save_file_to_db(
+                        file_data=spool,
+                        filename=filename,
+                        file_type=job.export_format,
+                        description=f'{description} for {job.period_start.strftime("%B %Y")}',
+                        related_table='attendance',
+                        related_id=None,
+                        uploaded_by=job.requested_by
+                    )
+                if file_id is None:
+                    raise RuntimeError('Failed to store the generated file')
+                store_cached_report(report_format, job.period_start, job.period_end, data_version, file_id)
+            
+            description = f'Monthly {job.export_format} report exported for {job.period_start.strftime("%B %Y")}'
+            job.status = 'completed'
+            job.file_id = file_id
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+        except Exception as e:
+            print(f"Export job {job_id} error: {e}")
+            db.session.rollback()
+            job.status = 'failed'
+            job.error = str(e)
+            job.finished_at = datetime.utcnow()
+            db.session.commit()
+            return
+        
+        # Logged after the commit: the audit row is written on a separate connection
+        log_audit_action(job.requested_by, 'EXPORT', 'attendance', None,
+                       None, {'filename': filename, 'file_id': file_id, 'job_id': job_id}, description)
+
+def mark_export_job_failed(job_id, error):
+    """Record a job whose worker process died (or was cancelled) before it could report back"""
+    try:
+        with app.app_context():
+            ExportJob.query.filter(
+                ExportJob.id == job_id,
+                ExportJob.status.in_(EXPORT_JOB_ACTIVE_STATUSES)
+            ).update({'status': 'failed', 'error': error, 'finished_at': datetime.utcnow()},
+                     synchronize_session=False)
+            db.session.commit()
+    except Exception as e:
+        print(f"Export job {job_id} status error: {e}")
+
+export_job_runner = ExportJobRunner(
+    run_export_job,
+    max_workers=app.config['EXPORT_JOB_WORKERS'],
+    initializer=init_export_worker,
+    on_crash=mark_export_job_failed
+)
+
+def serialize_export_job(job):
+    return {
+        'id': job.id,
+        'format': job.export_format,
+        'period_start': job.period_start.isoformat(),
+        'period_end': job.period_end.isoformat(),
+        'status': job.status,
+        'file_id': job.file_id,
+        'download_url': f'/admin/files/{job.file_id}/download' if job.file_id else None,
+        'error': job.error,
+        'created_at': job.created_at.isoformat(),
+        'started_at': job.started_at.isoformat() if job.started_at else None,
+        'finished_at': job.finished_at.isoformat() if job.finished_at else None
+    }
+
+@app.route('/admin/attendance/export-jobs', methods=['POST'])
+@jwt_required()
+def create_export_job():
+    """Queue a monthly Excel/PDF/CSV/Parquet export; poll GET /admin/attendance/export-jobs/<id> for the file
+    
+    An identical job (same format and period) that is still queued or running is returned
+    instead of starting a second one.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        export_format = data.get('format', 'excel')
+        if export_format not in EXPORT_JOB_FORMATS:
+            return jsonify({'message': f'Invalid format. Must be one of: {", ".join(EXPORT_JOB_FORMATS)}'}), 400
+        if export_format == 'parquet' and not PARQUET_AVAILABLE:
+            return jsonify({'message': PARQUET_UNAVAILABLE_MESSAGE}), 501
+        
+        try:
+            date_obj = datetime.strptime(data.get('date', datetime.now().date().isoformat()), '%Y-%m-%d').date()
+        except (TypeError, ValueError):
+            return jsonify({'message': 'Invalid date format. Use YYYY-MM-DD'}), 400
+        
+        # Same range rules as the synchronous endpoints (PDF always covers the full month)
+        force_full_month = export_format == 'pdf' or bool(data.get('force_full_month', False))
+        first_day, last_day = monthly_export_range(date_obj, force_full_month)
+        
+        # Already generated for the current data: the job is complete without touching the pool
+        report_format = EXPORT_JOB_FORMATS[export_format][3]
+        cached_file = get_cached_report(report_format, first_day, last_day, report_data_version(first_day))
+        if cached_file:
+            now = datetime.utcnow()
+            job = ExportJob(
+                export_format=export_format,
+                period_start=first_day,
+                period_end=last_day,
+                status='completed',
+                file_id=cached_file.id,
+                requested_by=int(get_jwt_identity()),
+                created_at=now,
+                started_at=now,
+                finished_at=now
+            )
+            db.session.add(job)
+            db.session.commit()
+            return jsonify({'message': 'Export served from cache', 'job': serialize_export_job(job)}), 200
+        
+        stale_before = datetime.utcnow() - timedelta(seconds=app.config['EXPORT_JOB_TIMEOUT'])
+        in_flight = ExportJob.query.filter(
+            ExportJob.status.in_(EXPORT_JOB_ACTIVE_STATUSES),
+            ExportJob.created_at >= stale_before
+        )
+        
+        with export_job_lock:
+            existing = in_flight.filter(
+                ExportJob.export_format == export_format,
+                ExportJob.period_start == first_day,
+                ExportJob.period_end == last_day
+            ).order_by(ExportJob.id.desc()).first()
+            if existing:
+                return jsonify({
+                    'message': 'An identical export is already in progress',
+                    'job': serialize_export_job(existing)
+                }), 202
+            
+            if in_flight.count() >= app.config['EXPORT_JOB_MAX_PENDING']:
+                return jsonify({'message': 'Too many exports in progress, try again shortly'}), 429
+            
+            job = ExportJob(
+                export_format=export_format,
+                period_start=first_day,
+                period_end=last_day,
+                requested_by=int(get_jwt_identity())
+            )
+            db.session.add(job)
+            db.session.commit()
+            try:
+                export_job_runner.submit(job.id)
+            except Exception as e:
+                mark_export_job_failed(job.id, str(e))
+                raise
+        
+        return jsonify({'message': 'Export job queued', 'job': serialize_export_job(job)}), 202
+    except Exception as e:
+        db.session.rollback()
+        print(f"Export job error: {e}")
+        return jsonify({'message': f'Failed to queue export: {str(e)}'}), 500
+
+@app.route('/admin/attendance/export-jobs/<int:job_id>', methods=['GET'])
+@jwt_required()
+def get_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    return jsonify(serialize_export_job(job))
+
 # Department Management Endpoints
 @app.route('/admin/departments', methods=['GET'])
 @jwt_required()
+@cached_json_response(lambda: [REPORT_EMPLOYEES_SCOPE])
 def get_departments():
     include_inactive = request.args.get('include_inactive', 'false').lower() == 'true'
     
+    query = Department.query.options(joinedload(Department.manager))
     if include_inactive:
-        departments = Department.query.all()
+        departments = query.all()
     else:
-        departments = Department.query.filter_by(is_active=True).all()
+        departments = query.filter_by(is_active=True).all()
+    
+    # Active head-count per department in one grouped query instead of loading every collection
+    employee_counts = dict(db.session.query(
+        Employee.department_id, db.func.count(Employee.id)
+    ).filter(Employee.is_active == True).group_by(Employee.department_id))
     
     return jsonify([{
         'id': dept.id,
@@ -1389,7 +3538,7 @@ def get_departments():
         'manager_id': dept.manager_id,
         'manager_name': dept.manager.name if dept.manager else None,
         'is_active': dept.is_active,
-        'employee_count': len([emp for emp in dept.employees if emp.is_active]),
+        'employee_count': employee_counts.get(dept.id, 0),
         'created_at': dept.created_at.isoformat(),
         'updated_at': dept.updated_at.isoformat()
     } for dept in departments])
@@ -1425,6 +3574,7 @@ def add_department():
             is_active=is_active
         )
         db.session.add(department)
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -1495,6 +3645,7 @@ def update_department(department_id):
         if is_active is not None:
             department.is_active = is_active
         
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -1536,6 +3687,7 @@ def delete_department(department_id):
         
         department_name = department.name
         db.session.delete(department)
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -1551,10 +3703,11 @@ def delete_department(department_id):
 
 @app.route('/admin/employees/for-manager', methods=['GET'])
 @jwt_required()
+@cached_json_response(lambda: [REPORT_EMPLOYEES_SCOPE])
 def get_employees_for_manager():
     """Get active employees who can be assigned as department managers"""
     try:
-        employees = Employee.query.filter_by(is_active=True).all()
+        employees = Employee.query.options(joinedload(Employee.department)).filter_by(is_active=True).all()
         return jsonify([{
             'id': emp.id,
             'name': emp.name,
@@ -1574,7 +3727,7 @@ def get_files():
     per_page = request.args.get('per_page', 10, type=int)
     file_type = request.args.get('type')
     
-    query = FileStorage.query
+    query = FileStorage.query.options(joinedload(FileStorage.uploader))
     if file_type:
         query = query.filter_by(file_type=file_type)
     
@@ -1607,6 +3760,18 @@ def download_file(file_id):
         log_audit_action(get_jwt_identity(), 'DOWNLOAD', 'file_storage', file_id, 
                         None, {'filename': file_record.original_filename}, 'File downloaded')
         
+        if file_record.content_hash:
+            # Real path: zero-copy send with Range and conditional (ETag) support
+            return send_file(
+                file_store.local_path(file_record.content_hash),
+                as_attachment=True,
+                download_name=file_record.original_filename,
+                mimetype=file_record.mime_type,
+                conditional=True,
+                etag=file_record.content_hash
+            )
+        
+        # Rows not yet moved out of the database (see manage.py --migrate-files)
         return send_file(
             io.BytesIO(file_record.file_data),
             as_attachment=True,
@@ -1622,19 +3787,63 @@ def download_file(file_id):
 @app.route('/admin/leaves', methods=['GET'])
 @jwt_required()
 def get_leaves():
-    leaves = Leave.query.order_by(Leave.created_at.desc()).all()
-    return jsonify([{
-        'id': leave.id,
-        'employee_id': leave.employee_id,
-        'employee_name': leave.employee.name,
-        'leave_type': leave.leave_type,
-        'start_date': leave.start_date.isoformat(),
-        'end_date': leave.end_date.isoformat(),
-        'days_count': leave.days_count,
-        'reason': leave.reason,
-        'status': leave.status,
-        'created_at': leave.created_at.isoformat()
-    } for leave in leaves])
+    """List leave requests, newest first.
+    
+    Optional query parameters: fields=a,b (projection), status, employee_id, leave_type,
+    from/to (YYYY-MM-DD, leaves overlapping the range), and limit/cursor for keyset
+    pagination by (created_at, id).
+    """
+    columns = {
+        'id': Leave.id,
+        'employee_id': Leave.employee_id,
+        'employee_name': Employee.name,
+        'leave_type': Leave.leave_type,
+        'start_date': Leave.start_date,
+        'end_date': Leave.end_date,
+        'days_count': Leave.days_count,
+        'reason': Leave.reason,
+        'status': Leave.status,
+        'approved_by': Leave.approved_by,
+        'approved_at': Leave.approved_at,
+        'created_at': Leave.created_at,
+        'updated_at': Leave.updated_at
+    }
+    default_fields = ['id', 'employee_id', 'employee_name', 'leave_type', 'start_date', 'end_date',
+                      'days_count', 'reason', 'status', 'created_at']
+    try:
+        fields, limit, cursor = parse_listing_args(columns, default_fields)
+        status = request.args.get('status')
+        employee_id = request.args.get('employee_id', type=int)
+        leave_type = request.args.get('leave_type')
+        try:
+            range_start = datetime.strptime(request.args['from'], '%Y-%m-%d').date() if request.args.get('from') else None
+            range_end = datetime.strptime(request.args['to'], '%Y-%m-%d').date() if request.args.get('to') else None
+        except ValueError:
+            raise ValueError('Invalid from/to format. Use YYYY-MM-DD')
+        
+        def build_query(selected):
+            stmt = db.select(*selected).select_from(Leave)
+            if 'employee_name' in fields:
+                stmt = stmt.join(Employee, Leave.employee_id == Employee.id)
+            if status:
+                stmt = stmt.where(Leave.status == status)
+            if employee_id is not None:
+                stmt = stmt.where(Leave.employee_id == employee_id)
+            if leave_type:
+                stmt = stmt.where(Leave.leave_type == leave_type)
+            if range_start:
+                stmt = stmt.where(Leave.end_date >= range_start)
+            if range_end:
+                stmt = stmt.where(Leave.start_date <= range_end)
+            return stmt
+        
+        items, next_cursor = run_listing(
+            columns, fields, [(Leave.created_at, True), (Leave.id, True)], limit, cursor, build_query
+        )
+    except ValueError as e:
+        return jsonify({'message': str(e)}), 400
+    
+    return listing_response(items, limit, next_cursor)
 
 @app.route('/admin/leaves/<int:leave_id>/approve', methods=['PUT'])
 @jwt_required()
@@ -1675,10 +3884,11 @@ def approve_leave(leave_id):
 # Holiday Management Endpoints
 @app.route('/admin/holidays', methods=['GET'])
 @jwt_required()
+@cached_json_response(lambda: [HOLIDAYS_SCOPE])
 def get_holidays():
     """Get all holidays"""
     try:
-        holidays = Holiday.query.order_by(Holiday.date.asc()).all()
+        holidays = Holiday.query.options(joinedload(Holiday.creator)).order_by(Holiday.date.asc()).all()
         return jsonify([{
             'id': holiday.id,
             'name': holiday.name,
@@ -1729,6 +3939,7 @@ def add_holiday():
         )
         
         db.session.add(holiday)
+        bump_report_versions([report_month_scope(holiday.date), HOLIDAYS_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -1800,6 +4011,9 @@ def update_holiday(holiday_id):
         else:
             holiday_date = holiday.date
         
+        # Reports of both the old and the new month change
+        bump_report_versions([report_month_scope(holiday.date), report_month_scope(holiday_date), HOLIDAYS_SCOPE])
+        
         # Update holiday
         holiday.name = name.strip()
         holiday.date = holiday_date
@@ -1844,6 +4058,7 @@ def delete_holiday(holiday_id):
         holiday_date = holiday.date.isoformat()
         
         db.session.delete(holiday)
+        bump_report_versions([report_month_scope(holiday.date), HOLIDAYS_SCOPE])
         db.session.commit()
         
         # Log the action
@@ -1862,57 +4077,101 @@ def delete_holiday(holiday_id):
         print(f"Delete holiday error: {e}")
         return jsonify({'message': 'Internal server error'}), 500
 
+def seed_default_data():
+    """Create the default admin, the 'General' department and this year's default holidays when missing"""
+    # Create default admin if not exists
+    admin = Admin.query.filter_by(username='admin').first()
+    if not admin:
+        admin = Admin(
+            username='admin',
+            password_hash=generate_password_hash('admin123'),
+            email='admin@company.com',
+            full_name='System Administrator'
+        )
+        db.session.add(admin)
+        db.session.commit()
+        print("Default admin created - Username: admin, Password: admin123")
+    
+    # Create default department if not exists
+    dept = Department.query.filter_by(name='General').first()
+    if not dept:
+        dept = Department(
+            name='General',
+            description='General department for unassigned employees'
+        )
+        db.session.add(dept)
+        bump_report_versions([REPORT_EMPLOYEES_SCOPE])
+        db.session.commit()
+        print("Default department 'General' created")
+    
+    # Create default holidays if not exists
+    current_year = datetime.now().year
+    default_holidays = [
+        {'name': 'New Year Day', 'date': f'{current_year}-01-01'},
+        {'name': 'Christmas Day', 'date': f'{current_year}-12-25'},
+    ]
+    
+    for holiday_data in default_holidays:
+        existing_holiday = Holiday.query.filter_by(
+            name=holiday_data['name'],
+            date=datetime.strptime(holiday_data['date'], '%Y-%m-%d').date()
+        ).first()
+        
+        if not existing_holiday:
+            holiday = Holiday(
+                name=holiday_data['name'],
+                date=datetime.strptime(holiday_data['date'], '%Y-%m-%d').date(),
+                description=f"Default {holiday_data['name']} holiday",
+                created_by=admin.id
+            )
+            db.session.add(holiday)
+            bump_report_versions([report_month_scope(holiday.date), HOLIDAYS_SCOPE])
+    
+    db.session.commit()
+    print(f"Default holidays checked/created for year {current_year}")
+
+def create_app():
+    """Application factory for WSGI servers (gunicorn 'app:create_app()')
+    
+    Returns the configured app without touching the database: schema creation and
+    seeding are deploy steps (python manage.py --migrate --seed), not part of every
+    worker start.
+    """
+    return app
+
+def missing_schema_columns():
+    """'table.column' for every declared column that an existing table lacks
+    
+    db.create_all() only creates missing tables; columns added to existing ones need
+    python manage.py --migrate.
+    """
+    inspector = sqlalchemy_inspect(db.engine)
+    existing_tables = set(inspector.get_table_names())
+    missing = []
+    for table in db.metadata.tables.values():
+        if table.name in existing_tables:
+            columns = {column['name'] for column in inspector.get_columns(table.name)}
+            missing.extend(f"{table.name}.{column.name}" for column in table.columns if column.name not in columns)
+    return missing
+
 if __name__ == '__main__':
+    # Development server; production runs gunicorn -c gunicorn.conf.py
     with app.app_context():
         db.create_all()
         
-        # Create default admin if not exists
-        admin = Admin.query.filter_by(username='admin').first()
-        if not admin:
-            admin = Admin(
-                username='admin',
-                password_hash=generate_password_hash('admin123'),
-                email='admin@company.com',
-                full_name='System Administrator'
-            )
-            db.session.add(admin)
-            db.session.commit()
-            print("Default admin created - Username: admin, Password: admin123")
-        
-        # Create default department if not exists
-        dept = Department.query.filter_by(name='General').first()
-        if not dept:
-            dept = Department(
-                name='General',
-                description='General department for unassigned employees'
-            )
-            db.session.add(dept)
-            db.session.commit()
-            print("Default department 'General' created")
-        
-        # Create default holidays if not exists
-        current_year = datetime.now().year
-        default_holidays = [
-            {'name': 'New Year Day', 'date': f'{current_year}-01-01'},
-            {'name': 'Christmas Day', 'date': f'{current_year}-12-25'},
-        ]
+        # Fail fast instead of failing every query that touches a column the database lacks
+        missing_columns = missing_schema_columns()
+        if missing_columns:
+            print(f"[ERROR] Database schema is out of date (missing {', '.join(missing_columns)})")
+            print("Run: python manage.py --migrate")
+            raise SystemExit(1)
         
-        for holiday_data in default_holidays:
-            existing_holiday = Holiday.query.filter_by(
-                name=holiday_data['name'],
-                date=datetime.strptime(holiday_data['date'], '%Y-%m-%d').date()
-            ).first()
-            
-            if not existing_holiday:
-                holiday = Holiday(
-                    name=holiday_data['name'],
-                    date=datetime.strptime(holiday_data['date'], '%Y-%m-%d').date(),
-                    description=f"Default {holiday_data['name']} holiday",
-                    created_by=admin.id
-                )
-                db.session.add(holiday)
+        # Backfill the monthly summary table the first time it exists alongside attendance data
+        if not AttendanceMonthlySummary.query.first() and Attendance.query.first():
+            print(f"Monthly attendance summary rebuilt: {rebuild_monthly_summary()} rows")
+        if not AttendanceDailyCount.query.first() and Attendance.query.first():
+            print(f"Attendance daily counts rebuilt: {rebuild_attendance_daily_counts()} rows")
         
-        db.session.commit()
-        print(f"Default holidays checked/created for year {current_year}")
+        seed_default_data()
     
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,103 @@
+"""
+Buffered audit log writer
+
+Audit events are queued in-process and written by a background thread in batched
+multi-row inserts on their own connection, so request handlers never commit (or roll
+back) their session just to record an audit entry.
+"""
+
+import atexit
+import os
+import queue
+import threading
+
+
+class AuditLogWriter:
+    """Queue audit rows and flush them in batches from a daemon thread"""
+
+    def __init__(self, table, flush_interval=1.0, batch_size=500, max_queue_size=10000, put_timeout=0.5):
+        self.table = table
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_queue_size = max_queue_size
+        self.put_timeout = put_timeout
+        self.engine = None
+        self._lock = threading.Lock()
+        self._pid = None
+        self._queue = None
+        self._thread = None
+        self._stopping = None
+        self.written = 0
+        self.failed = 0
+        atexit.register(self.stop)
+
+    def start(self, engine):
+        """Start the flush thread for this process (restarted automatically after a fork)"""
+        with self._lock:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            self.engine = engine
+            self._pid = os.getpid()
+            self._queue = queue.Queue(maxsize=self.max_queue_size)
+            self._stopping = threading.Event()
+            self._thread = threading.Thread(target=self._run, name='audit-log-writer', daemon=True)
+            self._thread.start()
+
+    def submit(self, row, engine):
+        """Queue one audit row. When the queue stays full the row is written inline (backpressure)."""
+        self.start(engine)
+        try:
+            self._queue.put(row, timeout=self.put_timeout)
+        except queue.Full:
+            self._write([row])
+
+    def write_now(self, row, engine):
+        """Write a single row synchronously on a separate connection"""
+        self.engine = engine
+        self._write([row])
+
+    def _run(self):
+        while not self._stopping.wait(self.flush_interval):
+            self.flush()
+        self.flush()
+
+    def flush(self):
+        """Write everything queued so far in batches of at most batch_size rows"""
+        if self._queue is None:
+            return
+        while True:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+            if len(batch) < self.batch_size:
+                return
+
+    def _write(self, rows):
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(self.table.insert(), rows)
+            self.written += len(rows)
+        except Exception as e:
+            if len(rows) == 1:
+                self.failed += 1
+                print(f"Audit log error: {e}")
+                return
+            # Isolate the bad row(s) so one malformed event does not drop the whole batch
+            for row in rows:
+                self._write([row])
+
+    def stop(self, timeout=10):
+        """Drain everything still queued and stop the flush thread"""
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._stopping.set()
+        thread.join(timeout)
+        with self._lock:
+            self._thread = None
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark for Attendance Management System workers
+
+Imports the app in fresh interpreters, the way every server worker does, and reports
+import time and resident memory. The 'eager' row also imports the export renderers
+(openpyxl, reportlab, pyarrow when installed) right after the app, which is what every
+worker paid before they were loaded on first use.
+
+Usage:
+    python bench_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = r'''
+import json, sys, time
+
+def rss_mb():
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+baseline = rss_mb()
+started = time.perf_counter()
+import app
+if sys.argv[1] == 'eager':
+    import excel_report, pdf_report
+    if app.PARQUET_AVAILABLE:
+        import pyarrow.parquet
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'rss_mb': rss_mb(),
+    'rss_delta_mb': rss_mb() - baseline,
+    'modules': len(sys.modules),
+    'renderers_loaded': [name for name in ('openpyxl', 'reportlab', 'pyarrow') if name in sys.modules],
+}))
+'''
+
+
+def probe(mode, env):
+    """Run one fresh interpreter and return its measurements"""
+    result = subprocess.run([sys.executable, '-c', PROBE, mode], capture_output=True, text=True,
+                            env=env, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure worker import time and memory')
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters per mode (default: 5)')
+    args = parser.parse_args()
+
+    # Importing the app never connects, but keep it off any configured database
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+
+    print(f"{'mode':<8} {'import s':>9} {'RSS MB':>8} {'+RSS MB':>8} {'modules':>8}  renderers loaded")
+    rows = {}
+    for mode in ('lazy', 'eager'):
+        samples = [probe(mode, env) for _ in range(args.runs)]
+        rows[mode] = {key: statistics.median(sample[key] for sample in samples)
+                      for key in ('seconds', 'rss_mb', 'rss_delta_mb', 'modules')}
+        print(f"{mode:<8} {rows[mode]['seconds']:>9.3f} {rows[mode]['rss_mb']:>8.1f} "
+              f"{rows[mode]['rss_delta_mb']:>8.1f} {rows[mode]['modules']:>8.0f}  "
+              f"{', '.join(samples[-1]['renderers_loaded']) or '-'}")
+
+    saved_seconds = rows['eager']['seconds'] - rows['lazy']['seconds']
+    saved_mb = rows['eager']['rss_mb'] - rows['lazy']['rss_mb']
+    print(f"Lazy renderers save {saved_seconds:.3f}s and {saved_mb:.1f} MB per worker (medians of {args.runs} runs)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+SQL statement budget check for Attendance Management System
+
+Seeds a scratch SQLite database, calls each read endpoint and fails when an endpoint
+issues more statements than its budget. Budgets do not depend on the number of rows,
+so an N+1 lazy load shows up as soon as the seeded data has more than a few rows.
+The keyset-paginated endpoints are also checked to follow their own next cursors and
+to answer crafted cursors with 400.
+
+Usage:
+    python check_query_counts.py [--employees N]
+"""
+
+import argparse
+import base64
+import json
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+# Point the app at a throwaway database before it is imported (DATABASE_URL wins over .env)
+SCRATCH_DB = os.path.join(tempfile.mkdtemp(prefix='attendance_qc_'), 'query_counts.db')
+os.environ['DATABASE_URL'] = f"sqlite:///{SCRATCH_DB}"
+
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from werkzeug.security import generate_password_hash
+
+from app import (app, db, Admin, Attendance, Department, Employee, FileStorage, Holiday, Leave,
+                 rebuild_attendance_daily_counts, rebuild_monthly_summary)
+
+MONTH = date(2024, 3, 1)
+
+# Maximum statements per request, independent of how many rows exist.
+# The token's admin is resolved from the principal cache (warmed before measuring),
+# so authentication adds no statements.
+AUTH_STATEMENTS = 0
+QUERY_BUDGETS = {
+    '/admin/employees': AUTH_STATEMENTS + 1,
+    '/admin/employees/for-manager': AUTH_STATEMENTS + 1,
+    '/admin/departments': AUTH_STATEMENTS + 2,
+    '/admin/departments?include_inactive=true': AUTH_STATEMENTS + 2,
+    f'/admin/attendance/overview?date={MONTH.isoformat()}': AUTH_STATEMENTS + 2,
+    f'/admin/attendance/overview?date={MONTH.isoformat()}&format=matrix': AUTH_STATEMENTS + 2,
+    f'/admin/attendance/report?date={MONTH.isoformat()}': AUTH_STATEMENTS + 2,
+    # holidays, headcount, daily counts, one employee batch and its marks
+    f'/admin/attendance/validate?date={MONTH.isoformat()}': AUTH_STATEMENTS + 5,
+    '/admin/leaves': AUTH_STATEMENTS + 1,
+    '/admin/holidays': AUTH_STATEMENTS + 1,
+    '/admin/files': AUTH_STATEMENTS + 2,
+    # employee totals, day by department and status, pending leaves, holidays, daily counts
+    f'/admin/dashboard/summary?date={MONTH.isoformat()}': AUTH_STATEMENTS + 5,
+    # employee, holidays, grouped rollup, daily marks
+    f'/admin/employees/2/attendance-stats?month={MONTH.strftime("%Y-%m")}': AUTH_STATEMENTS + 4,
+}
+# Endpoints behind the response cache: a conditional GET with a current ETag is answered
+# with 304 after a single data-version lookup
+CONDITIONAL_GET_BUDGET = AUTH_STATEMENTS + 1
+CACHED_URLS = [
+    '/admin/employees/for-manager',
+    '/admin/departments',
+    f'/admin/attendance/overview?date={MONTH.isoformat()}',
+    '/admin/holidays',
+    f'/admin/dashboard/summary?date={MONTH.isoformat()}',
+]
+
+# Keyset cursors are opaque base64 JSON; these decode fine but do not match the sort key types
+VALIDATE_URL = f'/admin/attendance/validate?date={MONTH.isoformat()}&missing_limit=2'
+PAGINATED_URLS = [  # (first page URL, cursor parameter, next cursor field)
+    ('/admin/employees?limit=5', 'cursor', 'next_cursor'),
+    ('/admin/leaves?limit=5', 'cursor', 'next_cursor'),
+    (VALIDATE_URL, 'missing_cursor', 'missing_next_cursor'),
+]
+CRAFTED_CURSORS = [
+    ('/admin/employees?limit=5', 'cursor', ['x']),
+    ('/admin/employees?limit=5', 'cursor', [True]),
+    ('/admin/employees?limit=5', 'cursor', [[1]]),
+    ('/admin/leaves?limit=5', 'cursor', [1, 1]),
+    ('/admin/leaves?limit=5', 'cursor', [f'{MONTH.isoformat()}T00:00:00', 'x']),
+    (VALIDATE_URL, 'missing_cursor', ['abc', MONTH.isoformat()]),
+    (VALIDATE_URL, 'missing_cursor', [1, 5]),
+    (VALIDATE_URL, 'missing_cursor', [None, MONTH.isoformat()]),
+]
+
+
+def encode_test_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode('ascii')
+
+
+@contextmanager
+def count_statements():
+    """Collect every SQL statement executed on the app engine while the block runs"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def seed(employee_count):
+    """Fill the scratch database with enough rows to expose per-row lazy loads"""
+    db.create_all()
+    admin = Admin(username='admin', password_hash=generate_password_hash('admin123'))
+    departments = [Department(name=f'Department {i}') for i in range(5)]
+    db.session.add(admin)
+    db.session.add_all(departments)
+    db.session.commit()
+
+    employees = []
+    for i in range(employee_count):
+        employees.append(Employee(
+            employee_id=f'EMP{i:04d}',
+            name=f'Employee {i}',
+            email=f'employee{i}@company.com',
+            department_id=departments[i % len(departments)].id,
+            is_active=i % 7 != 0
+        ))
+    db.session.add_all(employees)
+    db.session.commit()
+
+    for department in departments:
+        department.manager_id = employees[department.id].id
+    for employee in employees:
+        for day in range(10):
+            db.session.add(Attendance(employee_id=employee.id, date=MONTH + timedelta(days=day), status='present'))
+        db.session.add(Leave(employee_id=employee.id, leave_type='sick', start_date=MONTH,
+                             end_date=MONTH, days_count=1))
+    for day in range(5):
+        db.session.add(Holiday(name=f'Holiday {day}', date=MONTH + timedelta(days=day * 3), created_by=admin.id))
+        db.session.add(FileStorage(filename=f'report{day}.pdf', original_filename=f'report{day}.pdf',
+                                   file_type='pdf', file_size=3, mime_type='application/pdf',
+                                   file_path=f'/uploads/report{day}.pdf', file_data=b'pdf',
+                                   uploaded_by=admin.id))
+    db.session.commit()
+    rebuild_monthly_summary()
+    rebuild_attendance_daily_counts()
+    return admin
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check SQL statement budgets of the read endpoints')
+    parser.add_argument('--employees', type=int, default=50, help='employees to seed (default: 50)')
+    args = parser.parse_args()
+
+    with app.app_context():
+        admin = seed(args.employees)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+
+    client = app.test_client()
+    failures = 0
+    with app.app_context():
+        client.get('/admin/test-token', headers=headers)
+    # Budgets measure the views themselves, not the response cache in front of them
+    app.config['RESPONSE_CACHE_ENABLED'] = False
+    for url, budget in QUERY_BUDGETS.items():
+        with app.app_context(), count_statements() as statements:
+            response = client.get(url, headers=headers)
+        over_budget = len(statements) > budget or response.status_code != 200
+        failures += over_budget
+        print(f"{'[FAIL]' if over_budget else '[OK]'} {url}: {len(statements)} statement(s), "
+              f"budget {budget}, HTTP {response.status_code}")
+
+    app.config['RESPONSE_CACHE_ENABLED'] = True
+    for url in CACHED_URLS:
+        with app.app_context():
+            etag = client.get(url, headers=headers).headers.get('ETag')
+        with app.app_context(), count_statements() as statements:
+            response = client.get(url, headers=dict(headers, **{'If-None-Match': etag or ''}))
+        over_budget = len(statements) > CONDITIONAL_GET_BUDGET or response.status_code != 304
+        failures += over_budget
+        print(f"{'[FAIL]' if over_budget else '[OK]'} {url} (If-None-Match): {len(statements)} statement(s), "
+              f"budget {CONDITIONAL_GET_BUDGET}, HTTP {response.status_code}")
+
+    for url, parameter, next_field in PAGINATED_URLS:
+        with app.app_context():
+            next_cursor = client.get(url, headers=headers).get_json().get(next_field)
+            response = client.get(f'{url}&{parameter}={next_cursor}', headers=headers) if next_cursor else None
+        failed = response is None or response.status_code != 200
+        failures += failed
+        print(f"{'[FAIL]' if failed else '[OK]'} {url} next page: HTTP {response.status_code if response else '-'}")
+
+    for url, parameter, values in CRAFTED_CURSORS:
+        with app.app_context():
+            response = client.get(f'{url}&{parameter}={encode_test_cursor(values)}', headers=headers)
+        failed = response.status_code != 400
+        failures += failed
+        print(f"{'[FAIL]' if failed else '[OK]'} {url} with {parameter} {json.dumps(values)}: "
+              f"HTTP {response.status_code}")
+
+    print(f"{failures} check(s) failed" if failures else "All endpoints within budget")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Excel workbook rendering for the monthly attendance exports
+
+openpyxl is only needed by the export endpoints, so app.py imports this module on first
+use instead of at startup. Callers pass plain rows; a day cell is a (value, style key)
+tuple where the key is 'header', 'cell', 'weekend', 'holiday' or a status name.
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+from openpyxl.utils import get_column_letter
+
+STATUS_COLORS = {
+    'present': '90EE90',
+    'half_day': 'FFFF99',
+    'absent': 'FFB6C1',
+    'leave': 'ADD8E6',
+    'overtime': 'DDA0DD'
+}
+HEADER_COLOR = '366092'
+WEEKEND_COLOR = 'F0F0F0'
+HOLIDAY_COLOR = 'FFE6E6'
+
+
+def column_width(max_length):
+    """Column width rule shared by the buffered and streaming Excel exports"""
+    return min(max(max_length + 2, 10), 30)
+
+
+def set_properties(wb, title):
+    wb.properties.title = title
+    wb.properties.subject = "Employee Attendance Report"
+    wb.properties.creator = "Attendance Management System"
+
+
+def solid_fill(color):
+    return PatternFill(start_color=color, end_color=color, fill_type="solid")
+
+
+def style_fills():
+    """Fill of each day-cell style key (None = no fill)"""
+    fills = {'cell': None, 'weekend': solid_fill(WEEKEND_COLOR), 'holiday': solid_fill(HOLIDAY_COLOR)}
+    fills.update((status, solid_fill(color)) for status, color in STATUS_COLORS.items())
+    return fills
+
+
+def register_named_styles(wb):
+    """Register the shared export styles once per workbook as att_<style key>"""
+    center_alignment = Alignment(horizontal="center", vertical="center")
+    named_styles = [NamedStyle(name='att_header', font=Font(bold=True, color="FFFFFF"),
+                               fill=solid_fill(HEADER_COLOR), alignment=center_alignment)]
+    for key, fill in style_fills().items():
+        named_style = NamedStyle(name=f'att_{key}', alignment=center_alignment)
+        if fill is not None:
+            named_style.fill = fill
+        named_styles.append(named_style)
+
+    for named_style in named_styles:
+        wb.add_named_style(named_style)
+    return {named_style.name for named_style in named_styles}
+
+
+def safe_sheet_title(title):
+    """Excel-safe worksheet title (limited characters, 31 chars max)"""
+    return ''.join(c for c in title if c.isalnum() or c in ' -_')[:31]
+
+
+def write_streaming_workbook(target, title, sheet_title, headers, widths, rows):
+    """Write a workbook with a write-only worksheet; memory does not grow with the row count
+
+    widths must be known up front (write-only mode). Day cells in rows are
+    (value, style key) tuples, other values are written as they are.
+    """
+    wb = Workbook(write_only=True)
+    set_properties(wb, title)
+    register_named_styles(wb)
+    ws = wb.create_sheet(title=safe_sheet_title(sheet_title))
+    for col, width in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    def styled(value, style_key):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.style = f'att_{style_key}'
+        return cell
+
+    ws.append([styled(header, 'header') for header in headers])
+    for row in rows:
+        ws.append([styled(*value) if isinstance(value, tuple) else value for value in row])
+    wb.save(target)
+
+
+def write_buffered_workbook(output, title, sheet_title, headers, rows):
+    """Write a regular workbook with per-cell formatting and widths fitted to the content"""
+    wb = Workbook()
+    ws = wb.active
+    ws.title = safe_sheet_title(sheet_title)
+    set_properties(wb, title)
+
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = solid_fill(HEADER_COLOR)
+    center_alignment = Alignment(horizontal="center", vertical="center")
+    fills = style_fills()
+
+    for col, header in enumerate(headers, 1):
+        cell = ws.cell(row=1, column=col, value=str(header))  # Ensure string value
+        cell.font = header_font
+        cell.fill = header_fill
+        cell.alignment = center_alignment
+    ws.row_dimensions[1].height = 25
+
+    for row_index, row in enumerate(rows, 2):
+        for col, value in enumerate(row, 1):
+            if isinstance(value, tuple):
+                value, style_key = value
+                cell = ws.cell(row=row_index, column=col, value=value)
+                cell.alignment = center_alignment
+                if fills.get(style_key) is not None:
+                    cell.fill = fills[style_key]
+            else:
+                ws.cell(row=row_index, column=col, value=value)
+
+    # Auto-adjust column widths
+    for column in ws.columns:
+        max_length = max((len(str(cell.value)) for cell in column if cell.value is not None), default=0)
+        ws.column_dimensions[column[0].column_letter].width = column_width(max_length)
+
+    wb.save(output)
@@ -0,0 +1,68 @@
+"""
+Background export jobs
+
+Excel and PDF rendering (openpyxl / reportlab) is CPU bound, so report jobs run on a
+process pool rather than on request threads. Each worker process imports the app once
+and renders with its own app context and database connections; the job row in the
+database is the only state shared with the web process.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+
+class ExportJobRunner:
+    """Submit job ids to a lazily created process pool (one pool per server process)"""
+
+    def __init__(self, job_function, max_workers=2, initializer=None, on_crash=None, start_method='spawn'):
+        self.job_function = job_function
+        self.max_workers = max_workers
+        self.initializer = initializer
+        self.on_crash = on_crash
+        self.start_method = start_method
+        self._lock = threading.Lock()
+        self._pid = None
+        self._executor = None
+        atexit.register(self.shutdown)
+
+    def _get_executor(self):
+        # A pool inherited through fork (e.g. a preloading server) belongs to the parent
+        if self._executor is None or self._pid != os.getpid():
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=self.initializer
+            )
+            self._pid = os.getpid()
+        return self._executor
+
+    def submit(self, job_id):
+        """Queue a job; the pool runs at most max_workers jobs at a time"""
+        with self._lock:
+            try:
+                future = self._get_executor().submit(self.job_function, job_id)
+            except BrokenProcessPool:
+                # A worker died (e.g. killed for memory); start a fresh pool once
+                self._executor = None
+                future = self._get_executor().submit(self.job_function, job_id)
+        future.add_done_callback(lambda done: self._job_finished(job_id, done))
+        return future
+
+    def _job_finished(self, job_id, future):
+        # The job function records its own failures; this only sees crashed or cancelled workers
+        error = 'Export job was cancelled' if future.cancelled() else future.exception()
+        if error is not None and self.on_crash:
+            self.on_crash(job_id, str(error) or error.__class__.__name__)
+
+    def shutdown(self):
+        """Stop the pool without waiting for queued jobs (they are reported as failed)"""
+        with self._lock:
+            executor = self._executor
+            if executor is None or self._pid != os.getpid():
+                return
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
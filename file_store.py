@@ -0,0 +1,84 @@
+"""
+Content-addressed storage for generated files
+
+Files are stored under their SHA-256 digest, so identical exports are written to disk
+only once. FileStorage rows keep the metadata and point at the digest.
+"""
+
+import hashlib
+import os
+import shutil
+import tempfile
+
+CHUNK_SIZE = 1024 * 1024
+
+
+class LocalFileStore:
+    """Store blobs on the local filesystem as <root>/<ab>/<cd>/<sha256>"""
+
+    name = 'local'
+
+    def __init__(self, root):
+        self.root = root
+
+    def relative_path(self, digest):
+        return os.path.join(digest[:2], digest[2:4], digest)
+
+    def local_path(self, digest):
+        """Real path of a stored blob, suitable for zero-copy send_file"""
+        return os.path.join(self.root, self.relative_path(digest))
+
+    def exists(self, digest):
+        return os.path.exists(self.local_path(digest))
+
+    def put_bytes(self, data):
+        """Store bytes and return (digest, size)"""
+        digest = hashlib.sha256(data).hexdigest()
+        if not self.exists(digest):
+            self._write_atomically(digest, lambda f: f.write(data))
+        return digest, len(data)
+
+    def put_file(self, file_obj):
+        """Store the contents of a binary file object (read from its start) and return (digest, size)"""
+        hasher = hashlib.sha256()
+        size = 0
+        file_obj.seek(0)
+        for chunk in iter(lambda: file_obj.read(CHUNK_SIZE), b''):
+            hasher.update(chunk)
+            size += len(chunk)
+        digest = hasher.hexdigest()
+
+        if not self.exists(digest):
+            file_obj.seek(0)
+            self._write_atomically(digest, lambda f: shutil.copyfileobj(file_obj, f, CHUNK_SIZE))
+        file_obj.seek(0)
+        return digest, size
+
+    def open(self, digest):
+        return open(self.local_path(digest), 'rb')
+
+    def _write_atomically(self, digest, writer):
+        """Write to a temp file in the target directory and rename it into place"""
+        path = self.local_path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                writer(f)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+FILE_STORE_BACKENDS = {
+    LocalFileStore.name: LocalFileStore,
+}
+
+
+def create_file_store(backend, root):
+    """Instantiate the configured storage backend"""
+    if backend not in FILE_STORE_BACKENDS:
+        raise ValueError(f"Unknown file storage backend '{backend}'. Available: {list(FILE_STORE_BACKENDS)}")
+    return FILE_STORE_BACKENDS[backend](root)
@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration for the Attendance Management System API
+
+    python manage.py --migrate --seed    # once per deploy
+    gunicorn -c gunicorn.conf.py
+
+Worker processes default to one per core (at least two) and each serves WEB_THREADS
+request threads; the app sizes its SQLAlchemy pool from the same WEB_THREADS, so the
+database sees at most workers x (WEB_THREADS + 1 + DB_MAX_OVERFLOW) connections. Keep
+that below the server's max_connections when scaling out.
+"""
+
+import multiprocessing
+import os
+
+cores = multiprocessing.cpu_count()
+
+wsgi_app = 'app:create_app()'
+bind = os.getenv('BIND', '0.0.0.0:5000')
+workers = int(os.getenv('WEB_WORKERS', str(max(2, cores))))
+worker_class = 'gthread'
+threads = int(os.getenv('WEB_THREADS', '4'))
+# The app reads WEB_THREADS when it is imported (after this file) to size its pool
+os.environ['WEB_THREADS'] = str(threads)
+
+# Import the app once in the master and fork workers from it: fast start and scale-out
+preload_app = True
+
+# Synchronous exports can take a while; long reports should use the export jobs endpoint
+timeout = int(os.getenv('WEB_TIMEOUT', '120'))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle workers periodically to bound memory growth
+max_requests = int(os.getenv('WEB_MAX_REQUESTS', '2000'))
+max_requests_jitter = max_requests // 10
+
+accesslog = '-'
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    # Pooled connections opened by the master while preloading must not be shared with workers
+    from app import app, db
+    with app.app_context():
+        db.engine.dispose(close=False)
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Database maintenance script for Attendance Management System
+
+Usage:
+    python manage.py --migrate         Create missing tables, columns and indexes, backfill summary tables
+    python manage.py --seed            Create the default admin, department and holidays when missing
+    python manage.py --migrate-files   Move FileStorage blobs out of the database into the file store
+    python manage.py --explain         Print the query plan of each hot report query
+"""
+
+import argparse
+import re
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, inspect
+from sqlalchemy.schema import CreateColumn
+
+from app import (app, db, file_store, Attendance, AttendanceDailyCount, AttendanceMonthlySummary, AuditLog,
+                 Department, Employee, FileStorage, Holiday, Leave, ReportCacheEntry, rebuild_attendance_daily_counts,
+                 rebuild_monthly_summary, seed_default_data)
+
+
+def migrate():
+    """Create missing tables, then add declared columns and indexes missing from existing tables"""
+    print("Running migrations...")
+    db.create_all()
+
+    created = 0
+    with db.engine.begin() as conn:
+        inspector = inspect(conn)
+        rebuild_report_cache_table(conn, inspector)
+        for table in db.metadata.tables.values():
+            # New columns are always nullable, so a plain ADD COLUMN works on every backend
+            existing_columns = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing_columns:
+                    ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                    conn.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                    print(f"[OK] Added column {column.name} to {table.name}")
+
+            existing = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in sorted(table.indexes, key=lambda ix: ix.name):
+                if index.name not in existing:
+                    index.create(bind=conn)
+                    created += 1
+                    print(f"[OK] Created index {index.name} on {table.name}")
+    print(f"[OK] {created} index(es) created")
+
+    if not AttendanceMonthlySummary.query.first() and Attendance.query.first():
+        print(f"[OK] Monthly attendance summary backfilled: {rebuild_monthly_summary()} rows")
+    if not AttendanceDailyCount.query.first() and Attendance.query.first():
+        print(f"[OK] Attendance daily counts backfilled: {rebuild_attendance_daily_counts()} rows")
+
+
+def rebuild_report_cache_table(conn, inspector):
+    """Recreate report_cache when its cache key constraint lacks declared columns
+
+    Constraints cannot be altered in place on every backend. The rows are only a cache
+    (their stored files stay in file_storage), so the table is dropped and created again.
+    """
+    table = ReportCacheEntry.__table__
+    declared = next(constraint for constraint in table.constraints if constraint.name == 'unique_report_cache_key')
+    declared_columns = [column.name for column in declared.columns]
+    existing = {constraint['name']: constraint['column_names']
+                for constraint in inspector.get_unique_constraints(table.name)}
+    if existing.get(declared.name, declared_columns) == declared_columns:
+        return
+    table.drop(bind=conn)
+    table.create(bind=conn)
+    inspector.clear_cache()
+    print(f"[OK] Recreated {table.name} with cache key ({', '.join(declared_columns)})")
+
+
+def migrate_files(batch_size=50):
+    """Copy FileStorage blobs into the content-addressed store and clear them from the table"""
+    print(f"Moving stored files to {app.config['FILE_STORAGE_ROOT']}...")
+    moved = 0
+    while True:
+        # Blobs are loaded one batch at a time; each batch is committed before the next
+        records = FileStorage.query.options(db.undefer(FileStorage.file_data)).filter(
+            FileStorage.content_hash.is_(None),
+            FileStorage.file_data.isnot(None)
+        ).order_by(FileStorage.id).limit(batch_size).all()
+        if not records:
+            break
+        for record in records:
+            record.content_hash, record.file_size = file_store.put_bytes(record.file_data)
+            record.file_path = file_store.relative_path(record.content_hash)
+            record.storage_backend = file_store.name
+            record.file_data = None
+        db.session.commit()
+        moved += len(records)
+        print(f"[OK] {moved} file(s) moved")
+    print(f"[OK] Migration finished: {moved} file(s) moved out of the database")
+
+
+def hot_queries():
+    """Representative versions of the queries issued by the monthly and listing endpoints.
+
+    Each entry is (name, statement, tables allowed to be scanned in full).
+    """
+    first_day = datetime.now().date().replace(day=1)
+    last_day = (first_day + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    in_month = and_(Attendance.date >= first_day, Attendance.date <= last_day)
+
+    return [
+        ('overview / clear month: attendance in month',
+         db.select(Attendance).where(in_month), set()),
+        ('daily report: attendance on one day',
+         db.select(Attendance.employee_id, Attendance.status).where(Attendance.date == first_day), set()),
+        ('validate: daily marked counts',
+         db.select(AttendanceDailyCount).where(AttendanceDailyCount.date >= first_day,
+                                               AttendanceDailyCount.date <= last_day), set()),
+        ('reports: month status matrix',
+         db.select(Attendance.employee_id, Attendance.date, Attendance.status).where(in_month), set()),
+        ('pdf: monthly summary counts of active employees',
+         db.select(AttendanceMonthlySummary.employee_id, db.func.sum(AttendanceMonthlySummary.present_count))
+         .join(Employee, Employee.id == AttendanceMonthlySummary.employee_id)
+         .where(AttendanceMonthlySummary.month >= first_day, AttendanceMonthlySummary.month <= last_day,
+                Employee.is_active == True)
+         .group_by(AttendanceMonthlySummary.employee_id), set()),
+        ('excel stream: active employees with departments',
+         db.select(Employee.id, Employee.name, Department.name)
+         .outerjoin(Department, Employee.department_id == Department.id)
+         .where(Employee.is_active == True).order_by(Employee.id), set()),
+        ('per-employee export: one employee marks in month',
+         db.select(Attendance.date, Attendance.status)
+         .where(Attendance.employee_id == 1, in_month), set()),
+        ('csv / parquet: active employees with their marks in month',
+         db.select(Employee.id, Attendance.date, Attendance.status)
+         .outerjoin(Attendance, and_(Attendance.employee_id == Employee.id, in_month))
+         .where(Employee.is_active == True).order_by(Employee.id), set()),
+        ('holidays in month',
+         db.select(Holiday).where(Holiday.date >= first_day, Holiday.date <= last_day), set()),
+        ('leaves listing',
+         db.select(Leave).order_by(Leave.created_at.desc()).limit(50), set()),
+        ('files listing by type',
+         db.select(FileStorage.id).where(FileStorage.file_type == 'excel')
+         .order_by(FileStorage.created_at.desc()).limit(10), set()),
+        ('audit log listing',
+         db.select(AuditLog).order_by(AuditLog.created_at.desc()).limit(50), set()),
+    ]
+
+
+def plan_problems(dialect, plan, allowed_scans):
+    """Return the full scans and sorts in a plan that are not explicitly allowed"""
+    problems = []
+    for row in plan:
+        if dialect == 'sqlite':
+            detail = row[-1]
+            match = re.match(r'SCAN (\w+)$', detail)
+            if match and match.group(1) not in allowed_scans:
+                problems.append(f'full scan of {match.group(1)}')
+            elif 'TEMP B-TREE FOR ORDER BY' in detail:
+                problems.append(detail.lower())
+        elif dialect in ('mysql', 'mariadb'):
+            row = dict(row._mapping)
+            if row.get('type') == 'ALL' and row.get('table') not in allowed_scans:
+                problems.append(f"full scan of {row.get('table')}")
+            if 'filesort' in (row.get('Extra') or ''):
+                problems.append(f"filesort on {row.get('table')}")
+        elif dialect == 'postgresql':
+            match = re.search(r'Seq Scan on (\w+)', row[0])
+            if match and match.group(1) not in allowed_scans:
+                problems.append(f'full scan of {match.group(1)}')
+    return problems
+
+
+def explain():
+    """Print query plans for the hot queries; returns the number of queries with problems"""
+    dialect = db.engine.dialect.name
+    prefix = 'EXPLAIN QUERY PLAN ' if dialect == 'sqlite' else 'EXPLAIN '
+    failures = 0
+
+    with db.engine.connect() as conn:
+        for name, stmt, allowed_scans in hot_queries():
+            sql = str(stmt.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+            plan = conn.exec_driver_sql(prefix + sql).fetchall()
+            problems = plan_problems(dialect, plan, allowed_scans)
+            failures += bool(problems)
+
+            print("=" * 70)
+            print(f"{'[WARN]' if problems else '[OK]'} {name}")
+            for row in plan:
+                print("    " + " | ".join(str(value) for value in row))
+            for problem in problems:
+                print(f"    -> {problem}")
+
+    print("=" * 70)
+    print(f"{failures} hot query plan(s) need attention" if failures else "All hot query plans use indexes")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Attendance Management System database maintenance')
+    parser.add_argument('--migrate', action='store_true', help='create missing tables, columns and indexes')
+    parser.add_argument('--seed', action='store_true', help='create default admin, department and holidays')
+    parser.add_argument('--migrate-files', action='store_true', help='move file blobs into the file store')
+    parser.add_argument('--explain', action='store_true', help='print query plans for hot queries')
+    args = parser.parse_args()
+
+    if not (args.migrate or args.seed or args.migrate_files or args.explain):
+        parser.print_help()
+        return 1
+
+    with app.app_context():
+        if args.migrate:
+            migrate()
+        if args.seed:
+            seed_default_data()
+        if args.migrate_files:
+            migrate_files()
+        if args.explain and explain():
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
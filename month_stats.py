@@ -0,0 +1,83 @@
+"""
+Month statistics engine shared by the attendance reports
+
+A period is loaded once into arrays: an employee index (rows), a day index (columns)
+and a status-code matrix. Status counts and working-day masks are derived with
+vectorized NumPy operations for the Excel exports (attendance workbook and monthly
+report) and custom-range PDF exports. Whole-month PDF exports read
+attendance_monthly_summary instead, and the validate endpoint reads
+attendance_daily_counts and iter_missing_attendance().
+"""
+
+from datetime import timedelta
+
+import numpy as np
+
+
+def period_days(first_day, last_day):
+    return [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+
+
+def day_masks(days, holiday_dates=()):
+    """(weekend, holiday, working) boolean masks over days; working = weekday and not a holiday"""
+    holiday_dates = set(holiday_dates)
+    weekend_mask = np.array([day.weekday() >= 5 for day in days], dtype=bool)
+    holiday_mask = np.array([day in holiday_dates for day in days], dtype=bool)
+    return weekend_mask, holiday_mask, ~weekend_mask & ~holiday_mask
+
+
+class MonthStats:
+    """Status codes of one period: row i is employee_ids[i], column j is days[j]
+
+    status_codes names each code (code 0 = not marked). Working days are weekdays that
+    are not holidays; every count is taken over working days only.
+    """
+
+    def __init__(self, employee_ids, first_day, last_day, codes, status_codes, holiday_dates=()):
+        self.employee_ids = np.asarray(employee_ids, dtype=np.int64)
+        self.first_day = first_day
+        self.last_day = last_day
+        self.days = period_days(first_day, last_day)
+        self.codes = np.asarray(codes, dtype=np.uint8).reshape(len(self.employee_ids), len(self.days))
+        self.status_codes = tuple(status_codes)
+        self.weekend_mask, self.holiday_mask, self.working_mask = day_masks(self.days, holiday_dates)
+
+        self._rows = None
+        self._counts = None
+
+    @classmethod
+    def from_buffer(cls, employee_ids, first_day, last_day, buffer, status_codes, holiday_dates=()):
+        """Wrap a row-major bytes-like matrix of status codes without copying it"""
+        return cls(employee_ids, first_day, last_day, np.frombuffer(buffer, dtype=np.uint8),
+                   status_codes, holiday_dates)
+
+    def row(self, employee_id):
+        """Row index of an employee, or None when the employee is not part of the period"""
+        if self._rows is None:
+            self._rows = {int(employee_id): row for row, employee_id in enumerate(self.employee_ids)}
+        return self._rows.get(employee_id)
+
+    def status_counts(self):
+        """(employees x status codes) counts over working days, from a single bincount"""
+        if self._counts is None:
+            working = self.codes[:, self.working_mask].astype(np.int64)
+            code_count = len(self.status_codes)
+            # Offset each row's codes into its own block of bins
+            offsets = (np.arange(working.shape[0], dtype=np.int64) * code_count)[:, None]
+            self._counts = np.bincount(
+                (working + offsets).ravel(), minlength=working.shape[0] * code_count
+            ).reshape(working.shape[0], code_count)
+        return self._counts
+
+    def counts_for(self, status):
+        """Per-employee count of one status on working days"""
+        return self.status_counts()[:, self.status_codes.index(status)]
+
+    def total_for(self, statuses):
+        """Per-employee count of any of the given statuses on working days"""
+        columns = [self.status_codes.index(status) for status in statuses]
+        return self.status_counts()[:, columns].sum(axis=1)
+
+    def status_names(self, row):
+        """Status name of each day for one row ('not_marked' where nothing is recorded)"""
+        return [self.status_codes[code] for code in self.codes[row].tolist()]
@@ -0,0 +1,167 @@
+"""
+Paged PDF rendering for the monthly attendance report
+
+The employee table is emitted in fixed-size chunks (each repeating the header row)
+instead of one giant Table, so reportlab's split/layout work stays proportional to a
+page rather than to the whole month. Every chunk shares one precompiled TableStyle and
+column widths computed once for the report.
+
+Department sections can be rendered in worker processes and concatenated afterwards;
+that needs the optional pypdf package and falls back to a single process without it.
+"""
+
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+
+try:
+    from pypdf import PdfWriter
+except ImportError:
+    PdfWriter = None
+
+TABLE_HEADER = ['Employee', 'Present', 'Half Day', 'Absent', 'Leave', 'Overtime', 'Total Days', 'Attendance %']
+CELL_PADDING = 12
+
+# Built once; every table chunk of every report reuses it
+TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 8),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE')
+])
+
+_styles = getSampleStyleSheet()
+TITLE_STYLE = ParagraphStyle('CustomTitle', parent=_styles['Heading1'], fontSize=16, spaceAfter=20, alignment=1)
+SECTION_STYLE = ParagraphStyle('SectionTitle', parent=_styles['Heading2'], fontSize=12, spaceAfter=10)
+NORMAL_STYLE = ParagraphStyle('CustomNormal', parent=_styles['Normal'], fontSize=8, leading=10)
+
+LEGEND_TEXT = (
+    "<b>Status Legend:</b><br/>"
+    "Present: Full working day<br/>"
+    "Half Day: Partial working day<br/>"
+    "Absent: Did not attend<br/>"
+    "Leave: On approved leave<br/>"
+    "Overtime: Worked extra hours<br/>"
+)
+
+
+def column_widths(sections):
+    """Column widths for every chunk, measured once over all rows (chunks stay aligned)"""
+    widths = [stringWidth(header, 'Helvetica-Bold', 10) + CELL_PADDING for header in TABLE_HEADER]
+    for _, rows in sections:
+        for row in rows:
+            for index, value in enumerate(row):
+                width = stringWidth(value, 'Helvetica', 8) + CELL_PADDING
+                if width > widths[index]:
+                    widths[index] = width
+    return widths
+
+
+def table_chunks(rows, widths, chunk_size):
+    """Yield Tables of at most chunk_size rows, each with a repeated header row"""
+    for start in range(0, len(rows), chunk_size):
+        table = Table([TABLE_HEADER] + rows[start:start + chunk_size], colWidths=widths, repeatRows=1)
+        table.setStyle(TABLE_STYLE)
+        yield table
+
+
+def build_story(sections, widths, chunk_size, title=None, summary_lines=(), legend=True):
+    """Flowables for one document; each titled section after the first starts on a new page"""
+    story = []
+    if title:
+        story.append(Paragraph(title, TITLE_STYLE))
+        story.append(Spacer(1, 20))
+    if summary_lines:
+        story.append(Paragraph("<b>Report Summary:</b><br/>" + "".join(f"{line}<br/>" for line in summary_lines),
+                               NORMAL_STYLE))
+        story.append(Spacer(1, 20))
+
+    for index, (section_title, rows) in enumerate(sections):
+        if section_title:
+            if index:
+                story.append(PageBreak())
+            story.append(Paragraph(escape(section_title), SECTION_STYLE))
+        story.extend(table_chunks(rows, widths, chunk_size))
+        story.append(Spacer(1, 20))
+
+    if legend:
+        story.append(Paragraph(LEGEND_TEXT, NORMAL_STYLE))
+    return story
+
+
+def render_document(output, story):
+    """Build a story into output and return the number of pages"""
+    doc = SimpleDocTemplate(output, pagesize=A4)
+    doc.build(story)
+    return doc.page
+
+
+def render_part(kwargs):
+    """Worker entry point: render one part of a report and return its PDF bytes"""
+    output = io.BytesIO()
+    render_document(output, build_story(**kwargs))
+    return output.getvalue()
+
+
+_pool_lock = threading.Lock()
+_pool = None
+_pool_pid = None
+
+
+def _section_pool(max_workers):
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def render_report(output, sections, title, summary_lines, chunk_size=200, parallel_workers=0):
+    """Render the report into output and return {'pages', 'seconds', 'parallel'}
+
+    sections is a list of (section title or None, rows) where rows are lists of strings
+    matching TABLE_HEADER. Section titles are plain text; title and summary_lines are
+    Paragraph markup, so callers escape any names they put there. With parallel_workers > 0,
+    more than one section and pypdf installed, sections are rendered in worker processes
+    and concatenated.
+    """
+    started = time.perf_counter()
+    widths = column_widths(sections)
+    parallel = bool(parallel_workers) and len(sections) > 1 and PdfWriter is not None
+
+    if parallel:
+        parts = [{
+            'sections': [section],
+            'widths': widths,
+            'chunk_size': chunk_size,
+            'title': title if index == 0 else None,
+            'summary_lines': summary_lines if index == 0 else (),
+            'legend': index == len(sections) - 1
+        } for index, section in enumerate(sections)]
+        writer = PdfWriter()
+        for part in _section_pool(parallel_workers).map(render_part, parts):
+            writer.append(io.BytesIO(part))
+        writer.write(output)
+        pages = len(writer.pages)
+    else:
+        pages = render_document(output, build_story(sections, widths, chunk_size, title, summary_lines))
+
+    return {'pages': pages, 'seconds': time.perf_counter() - started, 'parallel': parallel}
@@ -0,0 +1,72 @@
+"""
+In-process cache of resolved JWT principals
+
+Every protected request resolves its token's admin. Principals are small and change
+rarely, so they are kept in an LRU with a TTL: local updates invalidate an entry right
+away, and the TTL bounds how long an update made by another server process (or directly
+in the database) can go unnoticed.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class PrincipalCache:
+    """LRU of principals by id whose entries expire ttl seconds after they were loaded"""
+
+    def __init__(self, max_entries=1024, ttl=60.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, principal_id):
+        """Return the cached principal, or None when absent or expired"""
+        with self._lock:
+            entry = self._entries.get(principal_id)
+            if entry is not None and entry[0] <= self.clock():
+                del self._entries[principal_id]
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(principal_id)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, principal_id, principal):
+        with self._lock:
+            self._entries.pop(principal_id, None)
+            self._entries[principal_id] = (self.clock() + self.ttl, principal)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, principal_id):
+        with self._lock:
+            if self._entries.pop(principal_id, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else None
+            }
@@ -0,0 +1,128 @@
+"""
+Request and database instrumentation exposed in the Prometheus text format
+
+Every request is recorded under its route template (bounded label cardinality) with
+its latency, the SQL statements it issued, their total time and the ORM objects it
+loaded. Counters live in the server process; with several gunicorn workers each
+scrape reports the worker that answered it.
+"""
+
+import threading
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+STATEMENT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 500)
+
+
+class Histogram:
+    """Cumulative bucket counts plus sum and count for one label set"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def samples(self, name, labels):
+        cumulative = 0
+        for bound, count in zip(list(self.buckets) + ['+Inf'], self.counts):
+            cumulative += count
+            yield f'{name}_bucket{format_labels(labels + [("le", bound)])} {cumulative}'
+        yield f'{name}_sum{format_labels(labels)} {self.sum}'
+        yield f'{name}_count{format_labels(labels)} {self.count}'
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in labels)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(labels, escaped)) + '}'
+
+
+class RequestMetrics:
+    """Thread-safe per-endpoint request, SQL and ORM load metrics"""
+
+    def __init__(self, prefix='attendance'):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.requests = {}
+        self.latency = {}
+        self.statements = {}
+        self.statements_total = {}
+        self.db_seconds = {}
+        self.objects_loaded = {}
+        self.slow_queries = 0
+        self.background_statements = 0
+        self.background_db_seconds = 0.0
+
+    def observe_request(self, endpoint, method, status, seconds, statements, db_seconds, objects_loaded):
+        key = (endpoint, method)
+        with self._lock:
+            status_key = (endpoint, method, str(status))
+            self.requests[status_key] = self.requests.get(status_key, 0) + 1
+            self.latency.setdefault(key, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            self.statements.setdefault(key, Histogram(STATEMENT_BUCKETS)).observe(statements)
+            self.statements_total[key] = self.statements_total.get(key, 0) + statements
+            self.db_seconds[key] = self.db_seconds.get(key, 0.0) + db_seconds
+            self.objects_loaded[key] = self.objects_loaded.get(key, 0) + objects_loaded
+
+    def observe_background_query(self, seconds):
+        """A statement issued outside any request (audit writer, maintenance)"""
+        with self._lock:
+            self.background_statements += 1
+            self.background_db_seconds += seconds
+
+    def record_slow_query(self):
+        with self._lock:
+            self.slow_queries += 1
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        p = self.prefix
+        lines = []
+
+        def family(name, metric_type, help_text):
+            lines.append(f'# HELP {p}_{name} {help_text}')
+            lines.append(f'# TYPE {p}_{name} {metric_type}')
+
+        with self._lock:
+            family('http_requests_total', 'counter', 'Requests by route, method and status')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                labels = [('endpoint', endpoint), ('method', method), ('status', status)]
+                lines.append(f'{p}_http_requests_total{format_labels(labels)} {count}')
+
+            family('http_request_duration_seconds', 'histogram', 'Request latency by route')
+            for (endpoint, method), histogram in sorted(self.latency.items()):
+                lines.extend(histogram.samples(f'{p}_http_request_duration_seconds',
+                                               [('endpoint', endpoint), ('method', method)]))
+
+            family('db_statements_per_request', 'histogram', 'SQL statements issued per request')
+            for (endpoint, method), histogram in sorted(self.statements.items()):
+                lines.extend(histogram.samples(f'{p}_db_statements_per_request',
+                                               [('endpoint', endpoint), ('method', method)]))
+
+            for name, values, help_text in (
+                ('db_statements_total', self.statements_total, 'SQL statements issued by requests'),
+                ('db_seconds_total', self.db_seconds, 'Time spent executing SQL statements in requests'),
+                ('orm_objects_loaded_total', self.objects_loaded, 'ORM objects hydrated from query results'),
+            ):
+                family(name, 'counter', help_text)
+                for (endpoint, method), value in sorted(values.items()):
+                    lines.append(f'{p}_{name}{format_labels([("endpoint", endpoint), ("method", method)])} {value}')
+
+            family('db_background_statements_total', 'counter', 'SQL statements issued outside requests')
+            lines.append(f'{p}_db_background_statements_total {self.background_statements}')
+            family('db_background_seconds_total', 'counter', 'Time spent on SQL statements outside requests')
+            lines.append(f'{p}_db_background_seconds_total {self.background_db_seconds}')
+            family('db_slow_queries_total', 'counter', 'Statements slower than the slow-query threshold')
+            lines.append(f'{p}_db_slow_queries_total {self.slow_queries}')
+        return '\n'.join(lines) + '\n'
@@ -31,7 +31,7 @@ def setup_database():
     print("\nSetting up database...")
     
     try:
-        result = subprocess.run([sys.executable, "setup_database.py"], 
+        result = subprocess.run([sys.executable, "manage.py", "--migrate", "--seed"],
                               capture_output=True, text=True)
         if result.returncode == 0:
             print("[OK] Database setup completed")
@@ -125,15 +125,12 @@ export default function Attendance() {
     if (!selectedEmployee || selectedDates.length === 0) return
 
     try {
-      const promises = selectedDates.map(date => 
-        axios.post('/admin/attendance', {
-          employee_id: selectedEmployee.id,
-          date: date.toISOString().split('T')[0],
-          status: status
-        })
-      )
-
-      await Promise.all(promises)
+      // One request and one transaction for all selected dates
+      await axios.post('/admin/attendance/range', {
+        employee_id: selectedEmployee.id,
+        dates: selectedDates.map(date => date.toISOString().split('T')[0]),
+        status: status
+      })
       
       const newAttendanceData = { ...attendanceData }
       selectedDates.forEach(date => {
@@ -33,26 +33,16 @@ export default function Dashboard() {
     try {
       setLoading(true)
       
-      // Fetch employees
-      const employeesResponse = await axios.get('/admin/employees')
-      const employees = employeesResponse.data
-      
-      // Fetch today's attendance
+      // Counts are aggregated on the server
       const today = new Date().toISOString().split('T')[0]
-      const attendanceResponse = await axios.get(`/admin/attendance/report?date=${today}`)
-      const attendanceReport = attendanceResponse.data
-      
-      // Calculate stats
-      const totalEmployees = employees.length
-      const presentToday = attendanceReport.present_count || 0
-      const absentToday = attendanceReport.absent_count || 0
-      const attendanceRate = totalEmployees > 0 ? Math.round((presentToday / totalEmployees) * 100) : 0
+      const summaryResponse = await axios.get(`/admin/dashboard/summary?date=${today}`)
+      const summary = summaryResponse.data
       
       setStats({
-        totalEmployees,
-        presentToday,
-        absentToday,
-        attendanceRate,
+        totalEmployees: summary.employees.active,
+        presentToday: summary.today.status_counts.present || 0,
+        absentToday: summary.today.status_counts.absent || 0,
+        attendanceRate: Math.round(summary.today.attendance_rate),
         lateArrivals: 0 // This would come from your backend
       })
 
@@ -67,13 +57,11 @@ export default function Dashboard() {
         { name: 'Sun', present: 15, absent: 0 }
       ])
 
-      setDepartmentData([
-        { name: 'Development', value: 25, color: COLORS[0] },
-        { name: 'Marketing', value: 15, color: COLORS[1] },
-        { name: 'Sales', value: 10, color: COLORS[2] },
-        { name: 'HR', value: 8, color: COLORS[3] },
-        { name: 'Finance', value: 7, color: COLORS[4] }
-      ])
+      setDepartmentData(summary.departments.map((department, index) => ({
+        name: department.name,
+        value: department.active_employees,
+        color: COLORS[index % COLORS.length]
+      })))
 
     } catch (error) {
       console.error('Error fetching dashboard data:', error)
@@ -68,8 +68,10 @@ export default function LeaveOvertime() {
     try {
       setLoading(true)
       
-      // Fetch employees
-      const employeesResponse = await axios.get('/admin/employees')
+      // Fetch active employees (only the fields the selects need)
+      const employeesResponse = await axios.get('/admin/employees', {
+        params: { fields: 'id,name', active: true }
+      })
       setEmployees(employeesResponse.data)
 
       // Mock data for leave and overtime requests
@@ -13,7 +13,7 @@ import {
   User
 } from 'lucide-react'
 import { BarChart, Bar, XAxis, YAxis, CartesianGrid, Tooltip, ResponsiveContainer, LineChart, Line, PieChart, Pie, Cell } from 'recharts'
-import { format, startOfMonth, endOfMonth, eachDayOfInterval, subMonths } from 'date-fns'
+import { format, startOfMonth, endOfMonth, subMonths } from 'date-fns'
 import axios from 'axios'
 import toast from 'react-hot-toast'
 
@@ -60,75 +60,30 @@ export default function Reports() {
       const startDate = startOfMonth(selectedMonth).toISOString().split('T')[0]
       const endDate = endOfMonth(selectedMonth).toISOString().split('T')[0]
       
-      // Fetch monthly overview and extract selected employee's attendance
-      const overviewResponse = await axios.get(`/admin/attendance/overview?date=${startDate}`)
-      const attendanceData = (overviewResponse.data?.attendance_data || {})[selectedEmployee.id] || {}
-      const days = eachDayOfInterval({
-        start: startOfMonth(selectedMonth),
-        end: endOfMonth(selectedMonth)
-      })
+      // Day, week and month rollups are computed on the server from this employee's rows only
+      const statsResponse = await axios.get(
+        `/admin/employees/${selectedEmployee.id}/attendance-stats?start_date=${startDate}&end_date=${endDate}`
+      )
+      const stats = statsResponse.data
 
       const report = {
         employee: selectedEmployee,
         month: selectedMonth,
-        totalDays: days.length,
-        workingDays: days.filter(day => day.getDay() !== 0 && day.getDay() !== 6).length,
-        attendance: {
-          present: 0,
-          absent: 0,
-          half_day: 0,
-          leave: 0,
-          overtime: 0
-        },
-        dailyData: [],
-        weeklyTrend: []
-      }
-
-      // Calculate attendance stats
-      days.forEach(day => {
-        const dateString = day.toISOString().split('T')[0]
-        const status = attendanceData[dateString]
-        
-        if (status && report.attendance.hasOwnProperty(status)) {
-          report.attendance[status]++
-        }
-
-        // Daily data for chart
-        report.dailyData.push({
-          date: format(day, 'MMM dd'),
-          present: status === 'present' ? 1 : 0,
-          absent: status === 'absent' ? 1 : 0,
-          half_day: status === 'half_day' ? 1 : 0,
-          leave: status === 'leave' ? 1 : 0,
-          overtime: status === 'overtime' ? 1 : 0
-        })
-      })
-
-      // Weekly trend calculation
-      const weeks = Math.ceil(days.length / 7)
-      for (let week = 0; week < weeks; week++) {
-        const weekStart = week * 7
-        const weekEnd = Math.min(weekStart + 7, days.length)
-        const weekDays = days.slice(weekStart, weekEnd)
-        
-        const weekStats = {
-          week: `Week ${week + 1}`,
-          present: 0,
-          absent: 0,
-          half_day: 0,
-          leave: 0,
-          overtime: 0
-        }
-
-        weekDays.forEach(day => {
-          const dateString = day.toISOString().split('T')[0]
-          const status = attendanceData[dateString]
-          if (status && weekStats.hasOwnProperty(status)) {
-            weekStats[status]++
-          }
-        })
-
-        report.weeklyTrend.push(weekStats)
+        totalDays: stats.daily.length,
+        workingDays: stats.totals.working_days,
+        attendance: { ...stats.totals.status_counts },
+        dailyData: stats.daily.map(day => ({
+          date: format(new Date(`${day.date}T00:00:00`), 'MMM dd'),
+          present: day.status === 'present' ? 1 : 0,
+          absent: day.status === 'absent' ? 1 : 0,
+          half_day: day.status === 'half_day' ? 1 : 0,
+          leave: day.status === 'leave' ? 1 : 0,
+          overtime: day.status === 'overtime' ? 1 : 0
+        })),
+        weeklyTrend: stats.weekly.map((week, index) => ({
+          week: `Week ${index + 1}`,
+          ...week.status_counts
+        }))
       }
 
       setReportData(report)